@@ -9,6 +9,7 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 from pgvector.sqlalchemy import Vector
+from app.core.config import configure_hnsw_params
 
 # revision identifiers, used by Alembic.
 revision = '001_initial'
@@ -16,6 +17,36 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+INDEXES = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_id ON users (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email ON users (email)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_id ON jobs (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_title ON jobs (title)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_status ON jobs (status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_id ON resumes (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_status ON resumes (status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidates_id ON candidates (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidates_anonymized_id ON candidates (anonymized_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_id ON processing_queue (id)",
+    # Only live entries are polled; completed/failed rows (the bulk) stay out of the index.
+    # status leads so "WHERE status = 'pending' ORDER BY created_at" is one ordered range scan
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_active ON processing_queue (status, created_at) "
+    "WHERE status IN ('pending', 'retrying', 'processing')",
+    # job_id / resume_id lookups are served by these composites (leading column)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_job_status ON processing_queue (job_id, status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_resume_status ON processing_queue (resume_id, status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_id ON match_results (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_candidate_id ON match_results (candidate_id)",
+    # One result per (job, candidate); also the arbiter for ON CONFLICT upserts
+    "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_match_results_job_candidate "
+    "ON match_results (job_id, candidate_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_overall_score ON match_results (overall_score)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_rank ON match_results (rank)",
+    # job_id lookups are served by the (job_id, ...) composites
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_job_score ON match_results (job_id, overall_score)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_job_rank ON match_results (job_id, rank)",
+)
+
 
 def upgrade() -> None:
     # Enable pgvector extension
@@ -42,8 +73,6 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
     )
-    op.create_index('ix_users_id', 'users', ['id'])
-    op.create_index('ix_users_email', 'users', ['email'])
     
     # Create jobs table
     op.create_table(
@@ -58,9 +87,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
     )
-    op.create_index('ix_jobs_id', 'jobs', ['id'])
-    op.create_index('ix_jobs_title', 'jobs', ['title'])
-    op.create_index('ix_jobs_status', 'jobs', ['status'])
     
     # Create resumes table
     op.create_table(
@@ -78,10 +104,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ),
     )
-    op.create_index('ix_resumes_id', 'resumes', ['id'])
-    op.create_index('ix_resumes_status', 'resumes', ['status'])
-    # Vector similarity index
-    op.execute("CREATE INDEX IF NOT EXISTS ix_resume_embedding ON resumes USING ivfflat (embedding_vector vector_cosine_ops) WITH (lists = 100)")
     
     # Create candidates table
     op.create_table(
@@ -94,8 +116,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
     )
-    op.create_index('ix_candidates_id', 'candidates', ['id'])
-    op.create_index('ix_candidates_anonymized_id', 'candidates', ['anonymized_id'])
     
     # Create processing_queue table
     op.create_table(
@@ -114,12 +134,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
         sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
     )
-    op.create_index('ix_processing_queue_id', 'processing_queue', ['id'])
-    op.create_index('ix_processing_queue_job_id', 'processing_queue', ['job_id'])
-    op.create_index('ix_processing_queue_resume_id', 'processing_queue', ['resume_id'])
-    op.create_index('ix_processing_queue_status', 'processing_queue', ['status'])
-    op.create_index('ix_processing_queue_job_status', 'processing_queue', ['job_id', 'status'])
-    op.create_index('ix_processing_queue_resume_status', 'processing_queue', ['resume_id', 'status'])
     
     # Create match_results table
     op.create_table(
@@ -130,19 +144,32 @@ def upgrade() -> None:
         sa.Column('scores_json', postgresql.JSONB(), nullable=False),
         sa.Column('rank', sa.String(10), nullable=True),
         sa.Column('explanation', postgresql.JSONB(), nullable=True),
-        sa.Column('overall_score', sa.Numeric(5, 2), nullable=False),
+        sa.Column('overall_score', sa.REAL(), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
         sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
     )
-    op.create_index('ix_match_results_id', 'match_results', ['id'])
-    op.create_index('ix_match_results_job_id', 'match_results', ['job_id'])
-    op.create_index('ix_match_results_candidate_id', 'match_results', ['candidate_id'])
-    op.create_index('ix_match_results_overall_score', 'match_results', ['overall_score'])
-    op.create_index('ix_match_results_rank', 'match_results', ['rank'])
-    op.create_index('ix_match_results_job_score', 'match_results', ['job_id', 'overall_score'])
-    op.create_index('ix_match_results_job_rank', 'match_results', ['job_id', 'rank'])
+
+    # Size the HNSW graph from the rows already present (HNSW: higher QPS/recall than
+    # IVFFlat and no training step)
+    resume_count = op.get_bind().execute(sa.text("SELECT count(*) FROM resumes")).scalar() or 0
+    hnsw_params = configure_hnsw_params(resume_count)
+    
+    # Build indexes after all table DDL, outside the migration transaction, so CONCURRENTLY
+    # can be used and re-running against populated tables does not block writes
+    with op.get_context().autocommit_block():
+        for ddl in INDEXES:
+            op.execute(ddl)
+        
+        # Give the graph build enough memory to stay in RAM (session-level: no transaction here)
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resume_embedding ON resumes "
+            "USING hnsw (embedding_vector vector_cosine_ops) "
+            f"WITH (m = {hnsw_params['m']}, ef_construction = {hnsw_params['ef_construction']})"
+        )
+        op.execute("RESET maintenance_work_mem")
 
 
 def downgrade() -> None:
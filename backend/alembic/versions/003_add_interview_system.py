@@ -15,13 +15,28 @@ down_revision = '002_seed_admin'  # Matches revision ID from 002_seed_admin_user
 branch_labels = None
 depends_on = None
 
+INDEXES = (
+    # Partial index: only the (few) shortlisted rows, ordered for "shortlist for job X by score"
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_shortlisted ON match_results "
+    "(job_id, overall_score DESC) WHERE shortlisted",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_id ON interviews (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_job_id ON interviews (job_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_candidate_id ON interviews (candidate_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_interview_date ON interviews (interview_date)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_interview_status ON interviews (interview_status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_meeting_room_id ON interviews (meeting_room_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_job_candidate ON interviews (job_id, candidate_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_date_status ON interviews (interview_date, interview_status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_logs_id ON interview_logs (id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_logs_interview_id ON interview_logs (interview_id)",
+)
+
 
 def upgrade() -> None:
     # Add interview-related fields to match_results table (additive, backward-compatible)
     op.add_column('match_results', sa.Column('interview_enabled', sa.Boolean(), nullable=False, server_default='false'))
     op.add_column('match_results', sa.Column('online_interview_enabled', sa.Boolean(), nullable=False, server_default='false'))
     op.add_column('match_results', sa.Column('shortlisted', sa.Boolean(), nullable=False, server_default='false'))
-    op.create_index('ix_match_results_shortlisted', 'match_results', ['shortlisted'])
     
     # Create enum types safely (avoid DuplicateObject if types already exist)
     interview_type_enum = postgresql.ENUM('online', 'offline', name='interviewtype', create_type=False)
@@ -62,14 +77,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
         sa.ForeignKeyConstraint(['scheduled_by'], ['users.id'], ),
     )
-    op.create_index('ix_interviews_id', 'interviews', ['id'])
-    op.create_index('ix_interviews_job_id', 'interviews', ['job_id'])
-    op.create_index('ix_interviews_candidate_id', 'interviews', ['candidate_id'])
-    op.create_index('ix_interviews_interview_date', 'interviews', ['interview_date'])
-    op.create_index('ix_interviews_interview_status', 'interviews', ['interview_status'])
-    op.create_index('ix_interviews_meeting_room_id', 'interviews', ['meeting_room_id'])
-    op.create_index('ix_interview_job_candidate', 'interviews', ['job_id', 'candidate_id'])
-    op.create_index('ix_interview_date_status', 'interviews', ['interview_date', 'interview_status'])
     
     # Create interview_logs table
     op.create_table(
@@ -86,8 +93,11 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['interview_id'], ['interviews.id'], ),
         sa.ForeignKeyConstraint(['action_by'], ['users.id'], ),
     )
-    op.create_index('ix_interview_logs_id', 'interview_logs', ['id'])
-    op.create_index('ix_interview_logs_interview_id', 'interview_logs', ['interview_id'])
+    
+    # match_results is a live table: build indexes CONCURRENTLY, outside the transaction
+    with op.get_context().autocommit_block():
+        for ddl in INDEXES:
+            op.execute(ddl)
 
 
 def downgrade() -> None:
@@ -0,0 +1,30 @@
+"""Add GIN indexes for JSONB containment filters
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-22 12:00:00.000000
+
+jsonb_path_ops only supports @>, but is roughly half the size of the default jsonb_ops
+and faster for containment lookups, which is the only JSONB operator the API filters on.
+Built CONCURRENTLY (outside the migration transaction) so writes are not blocked.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resumes_parsed_data_gin "
+            "ON resumes USING gin (parsed_data_json jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_resumes_parsed_data_gin")
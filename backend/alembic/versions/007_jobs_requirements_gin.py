@@ -0,0 +1,29 @@
+"""Add GIN index on jobs.requirements_json
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-22 13:00:00.000000
+
+Same jsonb_path_ops containment index as resumes.parsed_data_json (see 006), so job
+filters written as requirements_json @> '{...}' avoid a sequential scan.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_requirements_gin "
+            "ON jobs USING gin (requirements_json jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_jobs_requirements_gin")
@@ -0,0 +1,49 @@
+"""Store counters, progress, sizes and ranks as integers
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-01-23 12:00:00.000000
+
+retry_count, progress, file_size and rank were VARCHAR columns holding integers, which
+meant Python-side int() parsing and lexicographic ORDER BY rank ("10" < "2").
+Indexes on these columns (e.g. ix_match_results_job_rank) are rebuilt by ALTER TYPE.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE processing_queue
+            ALTER COLUMN retry_count DROP DEFAULT,
+            ALTER COLUMN retry_count TYPE integer USING NULLIF(retry_count, '')::integer,
+            ALTER COLUMN retry_count SET DEFAULT 0,
+            ALTER COLUMN progress DROP DEFAULT,
+            ALTER COLUMN progress TYPE integer USING NULLIF(progress, '')::integer,
+            ALTER COLUMN progress SET DEFAULT 0
+    """)
+    op.execute(
+        "ALTER TABLE resumes ALTER COLUMN file_size TYPE bigint USING NULLIF(file_size, '')::bigint"
+    )
+    op.execute(
+        "ALTER TABLE match_results ALTER COLUMN rank TYPE integer USING NULLIF(rank, '')::integer"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE match_results ALTER COLUMN rank TYPE varchar(10) USING rank::varchar")
+    op.execute("ALTER TABLE resumes ALTER COLUMN file_size TYPE varchar(50) USING file_size::varchar")
+    op.execute("""
+        ALTER TABLE processing_queue
+            ALTER COLUMN retry_count DROP DEFAULT,
+            ALTER COLUMN retry_count TYPE varchar(10) USING retry_count::varchar,
+            ALTER COLUMN retry_count SET DEFAULT '0',
+            ALTER COLUMN progress DROP DEFAULT,
+            ALTER COLUMN progress TYPE varchar(10) USING progress::varchar,
+            ALTER COLUMN progress SET DEFAULT '0'
+    """)
@@ -0,0 +1,38 @@
+"""Drop single-column indexes covered by composite indexes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-01-24 12:00:00.000000
+
+ix_processing_queue_job_id, ix_processing_queue_resume_id and ix_match_results_job_id are
+prefixes of (job_id, status), (resume_id, status) and (job_id, overall_score), so Postgres
+can use the composites for the same lookups. 001 no longer creates them; this removes them
+from databases that were migrated before that change.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+REDUNDANT_INDEXES = (
+    ('ix_processing_queue_job_id', 'processing_queue', 'job_id'),
+    ('ix_processing_queue_resume_id', 'processing_queue', 'resume_id'),
+    ('ix_match_results_job_id', 'match_results', 'job_id'),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in REDUNDANT_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({column_name})"
+            )
@@ -0,0 +1,36 @@
+"""Replace the processing_queue status index with a partial index on live entries
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-01-24 13:00:00.000000
+
+Pollers only look for pending/retrying/processing entries in created_at order. Completed
+and failed rows make up nearly all of the table, so indexing just the live statuses keeps
+the btree small and cache-resident.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_active "
+            "ON processing_queue (created_at) "
+            "WHERE status IN ('pending', 'retrying', 'processing')"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_processing_queue_status")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_processing_queue_status "
+            "ON processing_queue (status)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_processing_queue_active")
@@ -0,0 +1,34 @@
+"""Make ix_match_results_shortlisted a partial index
+
+Revision ID: 011
+Revises: 010
+Create Date: 2024-01-25 12:00:00.000000
+
+A btree on a boolean that is false for nearly every row mostly costs writes. Index only
+shortlisted rows, keyed by (job_id, overall_score DESC), so listing a job's shortlist by
+score is a single range scan. 003/004 now create this form; this upgrades older databases.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_match_results_shortlisted")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_match_results_shortlisted ON match_results "
+            "(job_id, overall_score DESC) WHERE shortlisted"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_match_results_shortlisted")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_match_results_shortlisted ON match_results (shortlisted)"
+        )
@@ -0,0 +1,40 @@
+"""Enforce one match result per (job, candidate)
+
+Revision ID: 012
+Revises: 011
+Create Date: 2024-01-26 12:00:00.000000
+
+Adds unique index uq_match_results_job_candidate. It serves direct (job, candidate)
+lookups and lets the scoring path upsert with ON CONFLICT (job_id, candidate_id).
+Existing duplicates are collapsed first, keeping the most recently updated row.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM match_results mr
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY job_id, candidate_id ORDER BY updated_at DESC, id
+            ) AS rn
+            FROM match_results
+        ) dup
+        WHERE mr.id = dup.id AND dup.rn > 1
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_match_results_job_candidate "
+            "ON match_results (job_id, candidate_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_match_results_job_candidate")
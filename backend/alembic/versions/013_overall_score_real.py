@@ -0,0 +1,28 @@
+"""Store match_results.overall_score as real
+
+Revision ID: 013
+Revises: 012
+Create Date: 2024-01-27 12:00:00.000000
+
+NUMERIC(5,2) is variable-length with software arithmetic; real (float4) is 4 bytes and
+compares natively, which speeds ORDER BY overall_score and shrinks the score indexes.
+Two-decimal presentation is handled by the API schema.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE match_results ALTER COLUMN overall_score TYPE real USING overall_score::real")
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE match_results ALTER COLUMN overall_score TYPE numeric(5, 2) "
+        "USING round(overall_score::numeric, 2)"
+    )
@@ -0,0 +1,38 @@
+"""Lead the processing_queue poll index with status
+
+Revision ID: 014
+Revises: 013
+Create Date: 2024-01-28 12:00:00.000000
+
+Workers poll with WHERE status = 'pending' ORDER BY created_at. Keying the partial
+ix_processing_queue_active on (status, created_at) turns that into a single ordered range
+scan instead of walking all live entries and filtering out retrying/processing rows.
+(job_id, status) stays for per-job progress lookups.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+LIVE_STATUSES = "status IN ('pending', 'retrying', 'processing')"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_processing_queue_active")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_processing_queue_active "
+            f"ON processing_queue (status, created_at) WHERE {LIVE_STATUSES}"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_processing_queue_active")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_processing_queue_active "
+            f"ON processing_queue (created_at) WHERE {LIVE_STATUSES}"
+        )
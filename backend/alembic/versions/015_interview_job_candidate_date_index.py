@@ -0,0 +1,39 @@
+"""Extend the interviews (job_id, candidate_id) index with interview_date
+
+Revision ID: 015
+Revises: 014
+Create Date: 2024-01-29 12:00:00.000000
+
+Interview lookups filter on job_id and/or candidate_id and order by interview_date.
+ix_interview_job_cand_date serves both the equality probe and the ordering from one
+B-tree, and its (job_id, ...) prefix makes ix_interview_job_candidate and
+ix_interviews_job_id redundant. The match_results side already has
+uq_match_results_job_candidate (012).
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_job_cand_date "
+            "ON interviews (job_id, candidate_id, interview_date)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interview_job_candidate")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interviews_job_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_job_id ON interviews (job_id)")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interview_job_candidate "
+            "ON interviews (job_id, candidate_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interview_job_cand_date")
@@ -0,0 +1,35 @@
+"""Index interviews for the list endpoint's ORDER BY
+
+Revision ID: 016
+Revises: 015
+Create Date: 2024-01-30 12:00:00.000000
+
+list_interviews orders (and keyset-paginates) by interview_date DESC, id DESC.
+ix_interviews_date_desc_id matches that order exactly, so pages come from an index scan
+with no Sort node. It supersedes the single-column ix_interviews_interview_date.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_date_desc_id "
+            "ON interviews (interview_date DESC, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interviews_interview_date")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviews_interview_date "
+            "ON interviews (interview_date)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interviews_date_desc_id")
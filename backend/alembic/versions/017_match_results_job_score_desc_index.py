@@ -0,0 +1,36 @@
+"""Index match results in ranked order per job
+
+Revision ID: 017
+Revises: 016
+Create Date: 2024-01-31 12:00:00.000000
+
+get_ranked_results_for_job orders a job's results by overall_score DESC, rank ASC and
+takes the first `limit` rows. ix_match_results_job_score_desc matches that order exactly,
+so Postgres stops after `limit` index entries instead of sorting every result for the job.
+It supersedes the ascending ix_match_results_job_score.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_job_score_desc "
+            "ON match_results (job_id, overall_score DESC, rank)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_match_results_job_score")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_results_job_score "
+            "ON match_results (job_id, overall_score)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_match_results_job_score_desc")
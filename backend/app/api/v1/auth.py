@@ -3,10 +3,12 @@ Authentication endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.database import get_db
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.user import User
-from app.schemas.user import UserCreate, User as UserSchema, Token, UserLogin
+from app.schemas.user import AuthenticatedUser, UserCreate, User as UserSchema, Token, UserLogin
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.dependencies import get_current_active_user
 from datetime import timedelta
@@ -17,26 +19,41 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Token lifetime is fixed for the process; build the timedelta once instead of per login
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# Verified against when the email is unknown, so both failure paths cost one bcrypt check
+# (flat latency, and response timing no longer reveals which emails are registered)
+DUMMY_PASSWORD_HASH = get_password_hash("dummy-password-for-timing")
+
+
+def _login_lookup(email: str):
+    """Column-projected lookup of an active user (no ORM instance materialized)"""
+    return select(User.id, User.email, User.hashed_password).where(
+        User.email == email,
+        User.is_active.is_(True)
+    )
+
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user
     """
     try:
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        existing_user = (await db.execute(select(User.id).where(User.email == user_data.email))).first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
-        # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        # Create new user (bcrypt is CPU-bound; keep it off the event loop)
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
         new_user = User(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -45,8 +62,8 @@ async def register(
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
         logger.info(f"New user registered: {new_user.email}")
         return new_user
@@ -54,7 +71,7 @@ async def register(
         raise
     except Exception as e:
         logger.error(f"Error registering user: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error registering user: {str(e)}"
@@ -64,7 +81,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login and get access token
@@ -72,38 +89,25 @@ async def login(
     try:
         logger.info(f"Login attempt for email: {form_data.username}")
         
-        # Find user by email
-        user = db.query(User).filter(User.email == form_data.username).first()
+        # Find active user by email; only the columns needed to verify and issue a token
+        user = (await db.execute(_login_lookup(form_data.username))).first()
         
-        if not user:
-            logger.warning(f"Login failed: User not found for email {form_data.username}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        password_hash = user.hashed_password if user else DUMMY_PASSWORD_HASH
+        password_ok = await run_in_threadpool(verify_password, form_data.password, password_hash)
         
-        if not verify_password(form_data.password, user.hashed_password):
-            logger.warning(f"Login failed: Incorrect password for email {form_data.username}")
+        if not user or not password_ok:
+            logger.warning(f"Login failed: Invalid credentials for email {form_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        if not user.is_active:
-            logger.warning(f"Login failed: Inactive account for email {form_data.username}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is inactive"
-            )
-        
         # Create access token
         try:
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
                 data={"sub": user.email, "user_id": str(user.id)},
-                expires_delta=access_token_expires
+                expires_delta=ACCESS_TOKEN_EXPIRES
             )
         except Exception as token_error:
             logger.error(f"Error creating access token: {str(token_error)}", exc_info=True)
@@ -128,7 +132,7 @@ async def login(
 @router.post("/login/json", response_model=Token)
 async def login_json(
     user_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login with JSON body (alternative to form data)
@@ -136,36 +140,23 @@ async def login_json(
     try:
         logger.info(f"Login attempt (JSON) for email: {user_data.email}")
         
-        user = db.query(User).filter(User.email == user_data.email).first()
+        user = (await db.execute(_login_lookup(user_data.email))).first()
         
-        if not user:
-            logger.warning(f"Login failed: User not found for email {user_data.email}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        password_hash = user.hashed_password if user else DUMMY_PASSWORD_HASH
+        password_ok = await run_in_threadpool(verify_password, user_data.password, password_hash)
         
-        if not verify_password(user_data.password, user.hashed_password):
-            logger.warning(f"Login failed: Incorrect password for email {user_data.email}")
+        if not user or not password_ok:
+            logger.warning(f"Login failed: Invalid credentials for email {user_data.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        if not user.is_active:
-            logger.warning(f"Login failed: Inactive account for email {user_data.email}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is inactive"
-            )
-        
         try:
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
                 data={"sub": user.email, "user_id": str(user.id)},
-                expires_delta=access_token_expires
+                expires_delta=ACCESS_TOKEN_EXPIRES
             )
         except Exception as token_error:
             logger.error(f"Error creating access token: {str(token_error)}", exc_info=True)
@@ -189,10 +180,10 @@ async def login_json(
 
 @router.get("/me", response_model=UserSchema)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
-    Get current user information
+    Get current user information (served from the auth cache, no users query on a hit)
     """
     return current_user
 
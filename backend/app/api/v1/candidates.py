@@ -1,21 +1,99 @@
 """
 Candidate Management Endpoints
-Handles candidate shortlisting and interview toggle
+Handles candidate shortlisting (single and bulk) and interview toggle
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import case, func, lambda_stmt, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from decimal import Decimal
-from app.database import get_db
+from app.database import get_async_db
 from app.models.match_result import MatchResult
-from app.models.user import User
 from app.schemas.interview import InterviewToggleRequest
+from app.schemas.candidate import BulkShortlistRequest
 from app.core.dependencies import get_current_active_user
+from app.schemas.user import AuthenticatedUser
+from app.core.redis_client import cache_get, cache_set, cache_delete, cache_delete_many
+from typing import Dict, NoReturn
 import logging
+import orjson
+import re
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/candidates", tags=["candidates"])
+# orjson: these small dicts are serialized on every (frequently polled) call
+router = APIRouter(prefix="/candidates", tags=["candidates"], default_response_class=ORJSONResponse)
+
+# Missing interview/shortlist columns mean migrations 003/004 haven't been applied
+_SCHEMA_ERR_RE = re.compile(r"column.*(interview_enabled|shortlisted)", re.IGNORECASE | re.DOTALL)
+
+_SHORTLIST_LOCK = text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))")
+_BULK_SHORTLIST_LOCK = text(
+    "SELECT pg_advisory_xact_lock(hashtextextended(k, 0)) FROM unnest(CAST(:keys AS text[])) AS k ORDER BY k"
+)
+
+# The UI polls interview status; shortlist/toggle writes invalidate the entry
+INTERVIEW_STATUS_CACHE_TTL = 60  # seconds
+
+
+def _interview_status_cache_key(job_id: UUID, candidate_id: UUID) -> str:
+    return f"interview_status:{job_id}:{candidate_id}"
+
+
+def _raise_schema_or_400(error_msg: str, context: str) -> NoReturn:
+    """Map a DB error to 500 + migration hint for schema mismatches, 400 otherwise"""
+    if _SCHEMA_ERR_RE.search(error_msg):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database schema mismatch. Please run migration: alembic upgrade head"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{context}: {error_msg}"
+    )
+
+
+def _match_result_stmt(job_id: UUID, candidate_id: UUID):
+    """(job, candidate) lookup; the lambda is analyzed and compiled once, ids become bound params"""
+    return lambda_stmt(lambda: select(MatchResult).where(
+        MatchResult.job_id == job_id,
+        MatchResult.candidate_id == candidate_id
+    ))
+
+
+def _shortlist_upsert(job_id: UUID, shortlist: Dict[UUID, bool]):
+    """
+    Single atomic UPSERT on uq_match_results_job_candidate: creates each match_result
+    if missing, otherwise flips shortlisted (unshortlisting also disables interviews)
+    """
+    stmt = pg_insert(MatchResult).values([
+        {
+            'job_id': job_id,
+            'candidate_id': candidate_id,
+            'shortlisted': shortlisted,
+            'interview_enabled': False,
+            'online_interview_enabled': False,
+            'scores_json': {},  # Empty dict for scores
+            'overall_score': 0.0,  # Default score
+            'rank': None,  # No rank initially
+        }
+        for candidate_id, shortlisted in shortlist.items()
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[MatchResult.job_id, MatchResult.candidate_id],
+        set_={
+            'shortlisted': stmt.excluded.shortlisted,
+            'interview_enabled': case(
+                (stmt.excluded.shortlisted, MatchResult.interview_enabled), else_=False
+            ),
+            'online_interview_enabled': case(
+                (stmt.excluded.shortlisted, MatchResult.online_interview_enabled), else_=False
+            ),
+            'updated_at': func.now(),
+        }
+    )
 
 
 @router.post("/{candidate_id}/shortlist", status_code=status.HTTP_200_OK)
@@ -23,8 +101,8 @@ async def shortlist_candidate(
     candidate_id: UUID,
     job_id: UUID = Query(..., description="Job ID"),
     shortlisted: bool = Query(True, description="Shortlist status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Shortlist or unshortlist a candidate for a job
@@ -33,87 +111,25 @@ async def shortlist_candidate(
     - Candidate becomes eligible for interview scheduling
     - Interview toggle becomes visible
     
-    This endpoint uses UPSERT logic - creates a match_result if it doesn't exist.
+    This endpoint uses UPSERT logic - creates a match_result if it doesn't exist
+    (INSERT ... ON CONFLICT, one round-trip, safe under concurrent toggles).
     """
     try:
         logger.info(f"{'Shortlisting' if shortlisted else 'Unshortlisting'} candidate {candidate_id} for job {job_id} by user {current_user.email}")
         
-        # Query for existing match result
-        match_result = db.query(MatchResult).filter(
-            MatchResult.job_id == job_id,
-            MatchResult.candidate_id == candidate_id
-        ).first()
+        stmt = _shortlist_upsert(job_id, {candidate_id: shortlisted}).returning(
+            MatchResult.shortlisted, MatchResult.interview_enabled
+        )
         
-        # If match_result doesn't exist, create it
-        if not match_result:
-            logger.info(f"Match result not found for candidate {candidate_id} and job {job_id}. Creating new match_result.")
-            try:
-                match_result = MatchResult(
-                    job_id=job_id,
-                    candidate_id=candidate_id,
-                    shortlisted=shortlisted,
-                    interview_enabled=False,
-                    online_interview_enabled=False,
-                    scores_json={},  # Empty dict for scores
-                    overall_score=Decimal('0.00'),  # Default score
-                    rank=None  # No rank initially
-                )
-                db.add(match_result)
-            except Exception as create_error:
-                db.rollback()
-                error_msg = str(create_error)
-                logger.error(f"Error creating match_result: {error_msg}", exc_info=True)
-                # Check if it's a column missing error
-                if 'column' in error_msg.lower() and ('interview_enabled' in error_msg or 'shortlisted' in error_msg):
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail="Database schema mismatch. Please run migration: alembic upgrade head"
-                    )
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to create match result: {error_msg}"
-                )
-        else:
-            # Update existing match result
-            try:
-                match_result.shortlisted = shortlisted
-                
-                # If unshortlisting, also disable interview
-                if not shortlisted:
-                    match_result.interview_enabled = False
-                    match_result.online_interview_enabled = False
-            except Exception as update_error:
-                db.rollback()
-                error_msg = str(update_error)
-                logger.error(f"Error updating match_result: {error_msg}", exc_info=True)
-                # Check if it's a column missing error
-                if 'column' in error_msg.lower() and ('interview_enabled' in error_msg or 'shortlisted' in error_msg):
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail="Database schema mismatch. Please run migration: alembic upgrade head"
-                    )
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to update match result: {error_msg}"
-                )
+        # Explicit commit rather than db.begin(): the session is shared with the auth
+        # dependency, so a transaction may already be open (failures roll back below).
+        # Serialize concurrent shortlist/unshortlist clicks for this (job, candidate) pair only;
+        # the transaction-scoped lock works before the row exists and is released at commit
+        await db.execute(_SHORTLIST_LOCK, {"key": f"{job_id}:{candidate_id}"})
+        match_result = (await db.execute(stmt)).one()
+        await db.commit()
         
-        try:
-            db.commit()
-            db.refresh(match_result)
-        except Exception as commit_error:
-            db.rollback()
-            error_msg = str(commit_error)
-            logger.error(f"Database commit failed: {error_msg}", exc_info=True)
-            # Check if it's a column missing error
-            if 'column' in error_msg.lower() and ('interview_enabled' in error_msg or 'shortlisted' in error_msg):
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Database schema mismatch. Please run migration: alembic upgrade head"
-                )
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to save shortlist status: {error_msg}"
-            )
+        await run_in_threadpool(cache_delete, _interview_status_cache_key(job_id, candidate_id))
         
         logger.info(f"Candidate {candidate_id} {'shortlisted' if shortlisted else 'unshortlisted'} successfully")
         
@@ -128,19 +144,69 @@ async def shortlist_candidate(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        error_msg = str(e)
-        logger.error(f"Error shortlisting candidate: {error_msg}", exc_info=True)
-        # Check if it's a column missing error
-        if 'column' in error_msg.lower() and ('interview_enabled' in error_msg or 'shortlisted' in error_msg):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database schema mismatch. Please run migration: alembic upgrade head"
-            )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error shortlisting candidate: {error_msg}"
+        await db.rollback()
+        logger.error(f"Error shortlisting candidate: {str(e)}", exc_info=True)
+        _raise_schema_or_400(str(e), "Error shortlisting candidate")
+
+
+@router.post("/bulk-shortlist", status_code=status.HTTP_200_OK)
+async def bulk_shortlist_candidates(
+    request: BulkShortlistRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Shortlist or unshortlist several candidates for one job in a single transaction
+    
+    Same rules as the single-candidate endpoint; all rows are written with one
+    multi-row INSERT ... ON CONFLICT. If a candidate appears more than once, the
+    last entry wins.
+    """
+    try:
+        job_id = request.job_id
+        # ON CONFLICT cannot touch the same row twice in one statement
+        shortlist = {item.candidate_id: item.shortlisted for item in request.items}
+        logger.info(f"Bulk shortlist update for {len(shortlist)} candidates, job {job_id} by user {current_user.email}")
+        
+        stmt = _shortlist_upsert(job_id, shortlist).returning(
+            MatchResult.candidate_id, MatchResult.shortlisted, MatchResult.interview_enabled
         )
+        
+        # Same per-pair locks as the single endpoint, taken in key order so two bulk
+        # requests over overlapping candidates can't deadlock; explicit commit as there
+        await db.execute(
+            _BULK_SHORTLIST_LOCK,
+            {"keys": [f"{job_id}:{candidate_id}" for candidate_id in shortlist]}
+        )
+        rows = (await db.execute(stmt)).all()
+        await db.commit()
+        
+        await run_in_threadpool(
+            cache_delete_many,
+            [_interview_status_cache_key(job_id, candidate_id) for candidate_id in shortlist]
+        )
+        
+        logger.info(f"Bulk shortlist update applied to {len(rows)} candidates")
+        
+        return {
+            "job_id": str(job_id),
+            "updated_count": len(rows),
+            "items": [
+                {
+                    "candidate_id": str(row.candidate_id),
+                    "shortlisted": row.shortlisted,
+                    "interview_enabled": row.interview_enabled,
+                }
+                for row in rows
+            ],
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error bulk shortlisting candidates: {str(e)}", exc_info=True)
+        _raise_schema_or_400(str(e), "Error shortlisting candidates")
 
 
 @router.post("/{candidate_id}/toggle-interview", status_code=status.HTTP_200_OK)
@@ -148,8 +214,8 @@ async def toggle_interview(
     candidate_id: UUID,
     job_id: UUID = Query(..., description="Job ID"),
     toggle_data: InterviewToggleRequest = ...,  # Make body required
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Toggle interview enabled status for a candidate
@@ -164,54 +230,56 @@ async def toggle_interview(
         logger.info(f"Toggling interview for candidate {candidate_id}, job {job_id} by user {current_user.email}")
         logger.debug(f"Toggle data: interview_enabled={toggle_data.interview_enabled}, online_interview_enabled={toggle_data.online_interview_enabled}")
         
-        # Query for existing match result
-        match_result = db.query(MatchResult).filter(
-            MatchResult.job_id == job_id,
-            MatchResult.candidate_id == candidate_id
-        ).first()
-        
-        # If match_result doesn't exist, create it (but candidate must be shortlisted first)
-        if not match_result:
+        # Can only enable online if interview is enabled
+        if toggle_data.online_interview_enabled and not toggle_data.interview_enabled:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Candidate must be shortlisted first. Please shortlist the candidate before enabling interview."
+                detail="Cannot enable online interview when interview is disabled"
             )
         
-        # Check if candidate is shortlisted
-        if not match_result.shortlisted:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Candidate must be shortlisted before enabling interview"
+        values = {'interview_enabled': toggle_data.interview_enabled, 'updated_at': func.now()}
+        if toggle_data.online_interview_enabled is not None:
+            values['online_interview_enabled'] = toggle_data.online_interview_enabled
+        elif not toggle_data.interview_enabled:
+            # If interview is disabled, also disable online
+            values['online_interview_enabled'] = False
+        
+        # Single UPDATE ... RETURNING; the shortlisted predicate enforces the shortlist rule atomically
+        stmt = (
+            update(MatchResult)
+            .where(
+                MatchResult.job_id == job_id,
+                MatchResult.candidate_id == candidate_id,
+                MatchResult.shortlisted.is_(True)
             )
+            .values(**values)
+            .returning(MatchResult.interview_enabled, MatchResult.online_interview_enabled)
+        )
         
-        # Update interview enabled status
-        match_result.interview_enabled = toggle_data.interview_enabled
+        match_result = (await db.execute(stmt)).first()
+        await db.commit()
         
-        # Update online interview enabled
-        if toggle_data.online_interview_enabled is not None:
-            # Can only enable online if interview is enabled
-            if toggle_data.online_interview_enabled and not toggle_data.interview_enabled:
+        # No row updated: match_result missing or candidate not shortlisted. Only this
+        # (rare) path pays for a lookup, and it reads the one boolean rather than the row.
+        if match_result is None:
+            shortlisted = await db.scalar(
+                select(MatchResult.shortlisted).where(
+                    MatchResult.job_id == job_id,
+                    MatchResult.candidate_id == candidate_id
+                )
+            )
+            if shortlisted is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Cannot enable online interview when interview is disabled"
+                    detail="Candidate must be shortlisted first. Please shortlist the candidate before enabling interview."
                 )
-            match_result.online_interview_enabled = toggle_data.online_interview_enabled
-        else:
-            # If interview is disabled, also disable online
-            if not toggle_data.interview_enabled:
-                match_result.online_interview_enabled = False
-        
-        try:
-            db.commit()
-            db.refresh(match_result)
-        except Exception as commit_error:
-            db.rollback()
-            logger.error(f"Database commit failed: {str(commit_error)}", exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to save interview status: {str(commit_error)}"
+                detail="Candidate must be shortlisted before enabling interview"
             )
         
+        await run_in_threadpool(cache_delete, _interview_status_cache_key(job_id, candidate_id))
+        
         logger.info(f"Interview toggled: enabled={match_result.interview_enabled}, online={match_result.online_interview_enabled}")
         
         return {
@@ -225,54 +293,56 @@ async def toggle_interview(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error toggling interview: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error toggling interview: {str(e)}"
-        )
+        _raise_schema_or_400(str(e), "Error toggling interview")
 
 
 @router.get("/{candidate_id}/interview-status")
 async def get_candidate_interview_status(
     candidate_id: UUID,
     job_id: UUID = Query(..., description="Job ID"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get interview status for a candidate
     
     Returns default values if match_result doesn't exist (no 404 error).
+    Responses are cached in Redis for INTERVIEW_STATUS_CACHE_TTL seconds.
     """
     try:
-        match_result = db.query(MatchResult).filter(
-            MatchResult.job_id == job_id,
-            MatchResult.candidate_id == candidate_id
-        ).first()
+        cache_key = _interview_status_cache_key(job_id, candidate_id)
+        cached = await run_in_threadpool(cache_get, cache_key)
+        if cached:
+            # Already-serialized JSON: hand it straight back
+            return Response(content=cached, media_type="application/json")
+        
+        match_result = (await db.execute(_match_result_stmt(job_id, candidate_id))).scalar_one_or_none()
         
         # Return defaults if match_result doesn't exist (don't raise 404)
         if not match_result:
-            return {
-                "candidate_id": str(candidate_id),
-                "job_id": str(job_id),
+            response = {
+                "candidate_id": candidate_id,
+                "job_id": job_id,
                 "shortlisted": False,
                 "interview_enabled": False,
                 "online_interview_enabled": False
             }
+        else:
+            response = {
+                "candidate_id": candidate_id,
+                "job_id": job_id,
+                "shortlisted": match_result.shortlisted,
+                "interview_enabled": match_result.interview_enabled,
+                "online_interview_enabled": match_result.online_interview_enabled
+            }
         
-        return {
-            "candidate_id": str(candidate_id),
-            "job_id": str(job_id),
-            "shortlisted": match_result.shortlisted,
-            "interview_enabled": match_result.interview_enabled,
-            "online_interview_enabled": match_result.online_interview_enabled
-        }
+        body = orjson.dumps(response)  # UUIDs serialized natively
+        await run_in_threadpool(cache_set, cache_key, body.decode(), INTERVIEW_STATUS_CACHE_TTL)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error getting interview status: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error retrieving status: {str(e)}"
-        )
+        _raise_schema_or_400(str(e), "Error retrieving status")
 
@@ -3,37 +3,69 @@ Interview Management Endpoints
 Handles interview scheduling, updates, and online interview access
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import desc, exists, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
-from app.database import get_db
+import base64
+import json
+from app.database import get_async_db
 from app.models.interview import Interview, InterviewStatus, InterviewType, InterviewLog
 from app.models.match_result import MatchResult
 from app.models.job import Job
 from app.models.candidate import Candidate
-from app.models.user import User
 from app.schemas.interview import (
     InterviewCreate, InterviewUpdate, Interview as InterviewSchema,
     InterviewListResponse, InterviewJoinRequest, InterviewJoinResponse,
     InterviewToggleRequest, InterviewLogResponse
 )
 from app.core.dependencies import get_current_active_user
+from app.schemas.user import AuthenticatedUser
 from app.services.interview_scheduler import interview_scheduler
 from app.services.online_interview_service import online_interview_service
+from app.tasks.interview_tasks import auto_update_interview_statuses
+from app.core.redis_client import cache_get, cache_set
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/interviews", tags=["interviews"])
 
+MEETING_ACCESS_DENIED_TTL = 10  # seconds
+
+# Service methods bound once at import; handlers call them without per-request attribute lookups
+_schedule = interview_scheduler.schedule_interview
+_update = interview_scheduler.update_interview
+_cancel = interview_scheduler.cancel_interview
+_mark_attendance = interview_scheduler.mark_attendance
+_validate_access = online_interview_service.validate_meeting_access
+
+
+def _encode_cursor(interview: Interview) -> str:
+    """Opaque keyset cursor for the (interview_date, id) position of a row"""
+    raw = f"{interview.interview_date.isoformat()}|{interview.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        last_date, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(last_date), UUID(last_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
 
 @router.post("", response_model=InterviewSchema, status_code=status.HTTP_201_CREATED)
 async def schedule_interview(
     interview_data: InterviewCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Schedule a new interview
@@ -46,18 +78,25 @@ async def schedule_interview(
     try:
         logger.info(f"Scheduling interview for candidate {interview_data.candidate_id} by user {current_user.email}")
         
-        # Validate match result exists and interview is enabled
-        match_result = db.query(MatchResult).filter(
-            MatchResult.job_id == interview_data.job_id,
-            MatchResult.candidate_id == interview_data.candidate_id
-        ).first()
+        # Validate match result exists and interview is enabled. The job is loaded in the
+        # same round-trip; match_results' FKs already guarantee the job and candidate exist.
+        row = (await db.execute(
+            select(MatchResult, Job)
+            .join(Job, Job.id == MatchResult.job_id)
+            .where(
+                MatchResult.job_id == interview_data.job_id,
+                MatchResult.candidate_id == interview_data.candidate_id
+            )
+        )).first()
         
-        if not match_result:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Match result not found. Please run candidate matching first."
             )
         
+        match_result, job = row
+        
         if not match_result.shortlisted:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,8 +109,8 @@ async def schedule_interview(
                 detail="Interview must be enabled for this candidate before scheduling"
             )
         
-        # Schedule interview
-        interview = interview_scheduler.schedule_interview(
+        # Schedule interview (the scheduler is sync; run it on the session's connection)
+        interview = await db.run_sync(lambda session: _schedule(
             job_id=interview_data.job_id,
             candidate_id=interview_data.candidate_id,
             interview_date=interview_data.interview_date,
@@ -83,8 +122,9 @@ async def schedule_interview(
             online_interview_enabled=interview_data.online_interview_enabled,
             scheduled_by=current_user.id,
             notes=interview_data.notes,
-            db=db
-        )
+            db=session,
+            prefetched_job=job
+        ))
         
         logger.info(f"Interview scheduled successfully: {interview.id}")
         return interview
@@ -109,33 +149,53 @@ async def schedule_interview(
 async def list_interviews(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination; skips the total count)"),
     job_id: Optional[UUID] = Query(None, description="Filter by job ID"),
     candidate_id: Optional[UUID] = Query(None, description="Filter by candidate ID"),
     status_filter: Optional[InterviewStatus] = Query(None, alias="status", description="Filter by status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     List interviews with pagination and filtering
+    
+    Pass `cursor` (the previous response's next_cursor) to page by keyset on
+    (interview_date, id); `total` is omitted in that mode. Without a cursor the
+    legacy page/offset behaviour is kept.
     """
     try:
         logger.info(f"Listing interviews - Page: {page}, Filters: job_id={job_id}, candidate_id={candidate_id}, status={status_filter}")
         
-        query = db.query(Interview)
+        # InterviewSchema only serializes scalar columns; refuse lazy relationship loads
+        # so a schema change can't silently turn this page into N+1 queries
+        query = select(Interview).options(raiseload('*'))
         
         # Apply filters
         if job_id:
-            query = query.filter(Interview.job_id == job_id)
+            query = query.where(Interview.job_id == job_id)
         if candidate_id:
-            query = query.filter(Interview.candidate_id == candidate_id)
+            query = query.where(Interview.candidate_id == candidate_id)
         if status_filter:
-            query = query.filter(Interview.interview_status == status_filter)
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination and ordering
-        interviews = query.order_by(desc(Interview.interview_date)).offset((page - 1) * page_size).limit(page_size).all()
+            query = query.where(Interview.interview_status == status_filter)
+        
+        if cursor:
+            last_date, last_id = _decode_cursor(cursor)
+            query = query.where(tuple_(Interview.interview_date, Interview.id) < tuple_(last_date, last_id))
+            total = None
+        else:
+            # Get total count
+            total = (await db.execute(
+                select(func.count()).select_from(query.subquery())
+            )).scalar_one()
+            query = query.offset((page - 1) * page_size)
+        
+        # Apply ordering (id breaks ties so the keyset position is unique) and fetch one extra row
+        # to know whether another page exists
+        interviews = (await db.execute(
+            query.order_by(desc(Interview.interview_date), desc(Interview.id)).limit(page_size + 1)
+        )).scalars().all()
+        has_more = len(interviews) > page_size
+        interviews = interviews[:page_size]
         
         logger.debug(f"Retrieved {len(interviews)} interviews")
         
@@ -143,9 +203,12 @@ async def list_interviews(
             items=interviews,
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=_encode_cursor(interviews[-1]) if has_more else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing interviews: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -157,14 +220,14 @@ async def list_interviews(
 @router.get("/{interview_id}", response_model=InterviewSchema)
 async def get_interview(
     interview_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get a specific interview by ID
     """
     try:
-        interview = db.query(Interview).filter(Interview.id == interview_id).first()
+        interview = await db.get(Interview, interview_id)
         
         if not interview:
             raise HTTPException(
@@ -188,8 +251,8 @@ async def get_interview(
 async def update_interview(
     interview_id: UUID,
     interview_data: InterviewUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Update an interview (reschedule or update details)
@@ -220,12 +283,12 @@ async def update_interview(
         if interview_data.notes is not None:
             updates['notes'] = interview_data.notes
         
-        interview = interview_scheduler.update_interview(
+        interview = await db.run_sync(lambda session: _update(
             interview_id=interview_id,
             updates=updates,
             updated_by=current_user.id,
-            db=db
-        )
+            db=session
+        ))
         
         return interview
         
@@ -247,8 +310,8 @@ async def update_interview(
 async def cancel_interview(
     interview_id: UUID,
     cancellation_reason: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Cancel an interview
@@ -256,12 +319,12 @@ async def cancel_interview(
     try:
         logger.info(f"Cancelling interview {interview_id} by user {current_user.email}")
         
-        interview = interview_scheduler.cancel_interview(
+        interview = await db.run_sync(lambda session: _cancel(
             interview_id=interview_id,
             cancellation_reason=cancellation_reason,
             cancelled_by=current_user.id,
-            db=db
-        )
+            db=session
+        ))
         
         return interview
         
@@ -283,7 +346,7 @@ async def cancel_interview(
 async def join_interview(
     interview_id: UUID,
     join_request: InterviewJoinRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Join an online interview
@@ -294,20 +357,38 @@ async def join_interview(
     try:
         logger.info(f"Join request for interview {interview_id}, room {join_request.meeting_room_id}, type: {join_request.participant_type}")
         
-        interview = db.query(Interview).filter(Interview.id == interview_id).first()
-        
-        if not interview:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Interview not found"
+        # Validate meeting access, reusing a recent verdict for this room/participant so
+        # join retries skip the interview lookup. mark_attendance re-checks the status.
+        cache_key = f"meeting_access:{interview_id}:{join_request.meeting_room_id}:{join_request.participant_type}"
+        cached = await run_in_threadpool(cache_get, cache_key)
+        if cached:
+            access_result = json.loads(cached)
+        else:
+            interview = await db.get(Interview, interview_id)
+            
+            if not interview:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Interview not found"
+                )
+            
+            access_result = _validate_access(
+                meeting_room_id=join_request.meeting_room_id,
+                interview=interview,
+                participant_type=join_request.participant_type
             )
-        
-        # Validate meeting access
-        access_result = online_interview_service.validate_meeting_access(
-            meeting_room_id=join_request.meeting_room_id,
-            interview=interview,
-            participant_type=join_request.participant_type
-        )
+            
+            if access_result['can_join']:
+                # Grants hold until the join window closes
+                ttl = int((datetime.fromisoformat(access_result['interview_end']) - datetime.now(timezone.utc)).total_seconds())
+            elif access_result['reason'] != 'ERROR':
+                # Short-lived denials blunt room-id guessing without delaying a legitimate first join
+                ttl = MEETING_ACCESS_DENIED_TTL
+            else:
+                ttl = 0
+            if ttl > 0:
+                cached_result = {'can_join': access_result['can_join'], 'message': access_result['message']}
+                await run_in_threadpool(cache_set, cache_key, json.dumps(cached_result), ttl)
         
         if not access_result['can_join']:
             raise HTTPException(
@@ -316,11 +397,11 @@ async def join_interview(
             )
         
         # Mark attendance
-        interview = interview_scheduler.mark_attendance(
+        interview = await db.run_sync(lambda session: _mark_attendance(
             interview_id=interview_id,
             participant_type=join_request.participant_type,
-            db=db
-        )
+            db=session
+        ))
         
         # Calculate interview end time
         interview_end = interview.interview_date + timedelta(minutes=interview.interview_duration)
@@ -348,25 +429,26 @@ async def join_interview(
 @router.get("/{interview_id}/logs", response_model=List[InterviewLogResponse])
 async def get_interview_logs(
     interview_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get audit logs for an interview
     """
     try:
-        # Verify interview exists
-        interview = db.query(Interview).filter(Interview.id == interview_id).first()
-        if not interview:
+        logs = (await db.execute(
+            select(InterviewLog).where(
+                InterviewLog.interview_id == interview_id
+            ).order_by(desc(InterviewLog.created_at))
+        )).scalars().all()
+        
+        # Every interview gets a SCHEDULED log, so only an empty result needs the existence check
+        if not logs and not await db.scalar(select(exists().where(Interview.id == interview_id))):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Interview not found"
             )
         
-        logs = db.query(InterviewLog).filter(
-            InterviewLog.interview_id == interview_id
-        ).order_by(desc(InterviewLog.created_at)).all()
-        
         return logs
         
     except HTTPException:
@@ -379,27 +461,27 @@ async def get_interview_logs(
         )
 
 
-@router.post("/auto-update-status")
+@router.post("/auto-update-status", status_code=status.HTTP_202_ACCEPTED)
 async def auto_update_interview_status(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Auto-update interview statuses based on time
-    Can be called by cron job or scheduled task
+    
+    Enqueues the update as a background task (it also runs periodically via
+    Celery Beat). Poll GET /tasks/{task_id} for the result.
     """
     try:
-        updated = interview_scheduler.update_interview_status_auto(db)
+        task = await run_in_threadpool(auto_update_interview_statuses.delay)
         
         return {
-            "updated_count": len(updated),
-            "updated_interviews": [str(i.id) for i in updated]
+            "task_id": task.id,
+            "status": "queued"
         }
         
     except Exception as e:
-        logger.error(f"Error auto-updating interview statuses: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing interview status update: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating statuses: {str(e)}"
         )
-
@@ -2,55 +2,57 @@
 Job management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from uuid import UUID
-from app.database import get_db
+from app.core.config import settings
+from app.database import get_async_db
 from app.models.job import Job, JobStatus
-from app.models.user import User
-from app.schemas.job import JobCreate, JobUpdate, Job as JobSchema, JobListResponse
+from app.models.resume import Resume
+from app.schemas.job import JobCreate, JobUpdate, Job as JobSchema, JobListResponse, MatchCandidatesResponse
 from app.core.dependencies import get_current_active_user
-from app.services.candidate_matcher import candidate_matcher
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from app.schemas.user import AuthenticatedUser
+from app.core.redis_client import cache_get, cache_set, cache_delete
+from app.tasks.matching_tasks import (
+    is_match_task_for_job,
+    match_cache_key,
+    match_candidates_task,
+    match_task_id,
+)
+from app.api.v1.tasks import task_status
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+JOB_CACHE_TTL = 300  # seconds; update/delete evict entries sooner
 
-class CandidateMatchResult(BaseModel):
-    """Individual candidate match result"""
-    candidate_id: str
-    anonymized_id: str
-    resume_id: str
-    resume_file_name: str
-    candidate_name: str
-    final_score: float
-    rank: int
-    component_scores: Dict[str, float]
-    matched_skills: List[str]
-    missing_skills: List[str]
-    experience_summary: str
 
+def _job_cache_key(job_id: UUID) -> str:
+    return f"job:{job_id}"
 
-class MatchCandidatesResponse(BaseModel):
-    """Response for match candidates endpoint"""
-    job_id: str
-    job_title: str
-    candidates_matched: int
-    ranked_candidates: List[CandidateMatchResult]
-    matching_weights: Dict[str, float]
-    message: Optional[str] = None
+# Columns of the Job schema; list pages select them directly and serialize the rows as-is
+_JOB_LIST_COLUMNS = (
+    Job.id, Job.title, Job.description, Job.requirements_json,
+    Job.status, Job.created_by, Job.created_at, Job.updated_at,
+)
+_DEFAULT_REQUIREMENTS = {
+    "required_skills": [],
+    "preferred_skills": [],
+    "required_experience_years": 0,
+    "preferred_experience_years": 0
+}
 
 
 @router.post("", response_model=JobSchema, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_data: JobCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Create a new job posting
@@ -64,71 +66,73 @@ async def create_job(
     )
     
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    await db.commit()
+    await db.refresh(new_job)
     
     logger.info(f"Job created: {new_job.id} by user {current_user.email}")
     return new_job
 
 
-@router.get("", response_model=JobListResponse)
+@router.get("", response_model=None, responses={200: {"model": JobListResponse}})
 async def list_jobs(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100, alias="pageSize"),  # Support both pageSize and page_size
     status_filter: JobStatus = Query(None, alias="status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    skill: Optional[str] = Query(None, description="Only jobs requiring this skill (exact, case-sensitive match)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     List all jobs with pagination and filtering
+    
+    `skill` must match an entry of requirements_json.required_skills exactly,
+    including case ("Python", not "python"). Unlike resume skills, which the NLP
+    pipeline stores lowercased, required_skills keep the casing the recruiter entered.
     """
     try:
         logger.info(f"Listing jobs - Page: {page}, PageSize: {page_size}, StatusFilter: {status_filter}, User: {current_user.email}")
         
-        query = db.query(Job)
+        query = select(*_JOB_LIST_COLUMNS)
         
         # Filter by status if provided
         if status_filter:
-            query = query.filter(Job.status == status_filter)
+            query = query.where(Job.status == status_filter)
         
-        # Get total count
-        try:
-            total = query.count()
-            logger.debug(f"Total jobs found: {total}")
-        except Exception as count_error:
-            logger.error(f"Error counting jobs: {str(count_error)}", exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error counting jobs: {str(count_error)}"
-            )
+        # Containment (@>) rather than ->> equality so ix_jobs_requirements_gin is used.
+        # @> compares strings exactly, hence the case-sensitive match documented above.
+        if skill:
+            query = query.where(Job.requirements_json.contains({'required_skills': [skill.strip()]}))
         
-        # Apply pagination
-        try:
-            jobs = query.order_by(desc(Job.created_at)).offset((page - 1) * page_size).limit(page_size).all()
-            logger.debug(f"Retrieved {len(jobs)} jobs")
-        except Exception as query_error:
-            logger.error(f"Error querying jobs: {str(query_error)}", exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error retrieving jobs: {str(query_error)}"
-            )
+        # Page and total in one round-trip: count(*) OVER () is evaluated before OFFSET/LIMIT
+        rows = (await db.execute(
+            query.add_columns(func.count().over().label('total'))
+            .order_by(desc(Job.created_at)).offset((page - 1) * page_size).limit(page_size)
+        )).all()
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # Past the last page: no row carries the total, so count separately
+            total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+        else:
+            total = 0
+        logger.debug(f"Retrieved {len(rows)} of {total} jobs")
         
-        # Ensure requirements_json has defaults for all jobs
-        for job in jobs:
-            if job.requirements_json is None:
-                job.requirements_json = {
-                    "required_skills": [],
-                    "preferred_skills": [],
-                    "required_experience_years": 0,
-                    "preferred_experience_years": 0
-                }
+        # Rows already have the JobListResponse item shape; skip per-item model validation
+        jobs = []
+        for row in rows:
+            job = dict(row._mapping)
+            del job['total']
+            # Ensure requirements_json has defaults for all jobs
+            if job['requirements_json'] is None:
+                job['requirements_json'] = dict(_DEFAULT_REQUIREMENTS)
+            jobs.append(job)
         
-        return JobListResponse(
-            items=jobs,
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        return ORJSONResponse({
+            "items": jobs,
+            "total": total,
+            "page": page,
+            "page_size": page_size
+        })
         
     except HTTPException:
         raise
@@ -144,13 +148,19 @@ async def list_jobs(
 @router.get("/{job_id}", response_model=JobSchema)
 async def get_job(
     job_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get a specific job by ID
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    cache_key = _job_cache_key(job_id)
+    cached = await run_in_threadpool(cache_get, cache_key)
+    if cached:
+        # Already-serialized JSON: hand it straight back
+        return Response(content=cached, media_type="application/json")
+    
+    job = await db.get(Job, job_id)
     
     if not job:
         raise HTTPException(
@@ -158,20 +168,22 @@ async def get_job(
             detail="Job not found"
         )
     
-    return job
+    payload = JobSchema.model_validate(job).model_dump_json()
+    await run_in_threadpool(cache_set, cache_key, payload, JOB_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.put("/{job_id}", response_model=JobSchema)
 async def update_job(
     job_id: UUID,
     job_data: JobUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Update a job posting
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     
     if not job:
         raise HTTPException(
@@ -189,8 +201,9 @@ async def update_job(
     if job_data.status is not None:
         job.status = job_data.status
     
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
+    await run_in_threadpool(cache_delete, _job_cache_key(job_id))
     
     logger.info(f"Job updated: {job.id} by user {current_user.email}")
     return job
@@ -199,13 +212,13 @@ async def update_job(
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_job(
     job_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Delete a job posting
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     
     if not job:
         raise HTTPException(
@@ -213,17 +226,22 @@ async def delete_job(
             detail="Job not found"
         )
     
-    db.delete(job)
-    db.commit()
+    await db.delete(job)
+    await db.commit()
+    await run_in_threadpool(cache_delete, _job_cache_key(job_id))
     
     logger.info(f"Job deleted: {job_id} by user {current_user.email}")
 
 
-@router.post("/{job_id}/match-candidates", response_model=MatchCandidatesResponse)
+@router.post(
+    "/{job_id}/match-candidates",
+    response_model=MatchCandidatesResponse,
+    responses={status.HTTP_202_ACCEPTED: {"description": "Matching queued; poll status_url for the result"}}
+)
 async def match_candidates_to_job(
     job_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Match all processed candidates to a job using weighted scoring:
@@ -231,11 +249,16 @@ async def match_candidates_to_job(
     - Experience: 30%
     - Semantic Similarity: 20%
     
-    Returns ranked list of candidates with match scores and details.
+    Ranks are competition ranks over the final (2-decimal) scores: candidates with
+    equal scores share a rank and the following rank is skipped (e.g. 1, 2, 2, 4).
+    
+    Returns the ranked candidates directly when a recent result for the same job and
+    resume set is cached; otherwise queues the matching task and returns 202 with a
+    task_id and status_url to poll.
     """
     try:
         # Verify job exists
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = await db.get(Job, job_id)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -248,44 +271,28 @@ async def match_candidates_to_job(
         
         logger.info(f"Matching candidates to job {job_id} by user {current_user.email}")
         
-        # Perform matching
-        match_results = candidate_matcher.match_candidates_to_job(
-            job_id=str(job_id),
-            db=db
-        )
+        # Matching is deterministic for a given job and resume set, so reuse a recent response
+        resume_rows = (await db.execute(
+            select(Resume.id, Resume.updated_at).order_by(Resume.id)
+        )).all()
+        cached = await run_in_threadpool(cache_get, match_cache_key(job, resume_rows))
+        if cached:
+            # Written by the matching task from a validated response; serve the bytes as-is
+            return Response(content=cached, media_type="application/json")
         
-        # Convert to response format
-        ranked_candidates = []
-        for candidate in match_results.get('ranked_candidates', []):
-            try:
-                # Ensure all required fields are present with defaults
-                candidate_data = {
-                    'candidate_id': str(candidate.get('candidate_id', '')),
-                    'anonymized_id': str(candidate.get('anonymized_id', '')),
-                    'resume_id': str(candidate.get('resume_id', '')),
-                    'resume_file_name': str(candidate.get('resume_file_name', '')),
-                    'candidate_name': str(candidate.get('candidate_name', 'Anonymous')),
-                    'final_score': float(candidate.get('final_score', 0.0)),
-                    'rank': int(candidate.get('rank', 0)),
-                    'component_scores': dict(candidate.get('component_scores', {})),
-                    'matched_skills': list(candidate.get('matched_skills', [])),
-                    'missing_skills': list(candidate.get('missing_skills', [])),
-                    'experience_summary': str(candidate.get('experience_summary', ''))
-                }
-                ranked_candidates.append(CandidateMatchResult(**candidate_data))
-            except Exception as e:
-                logger.error(f"Error creating CandidateMatchResult: {str(e)}", exc_info=True)
-                logger.error(f"Candidate data: {candidate}")
-                # Skip invalid candidates
-                continue
+        # Scoring runs on a Celery worker; the broker client is blocking
+        task = await run_in_threadpool(
+            lambda: match_candidates_task.apply_async(args=[str(job_id)], task_id=match_task_id(job_id))
+        )
+        logger.info(f"Queued matching for job {job_id}: task {task.id}")
         
-        return MatchCandidatesResponse(
-            job_id=str(match_results.get('job_id', job_id)),
-            job_title=str(match_results.get('job_title', job.title)),
-            candidates_matched=int(match_results.get('candidates_matched', len(ranked_candidates))),
-            ranked_candidates=ranked_candidates,
-            matching_weights=dict(match_results.get('matching_weights', {'skills': 0.5, 'experience': 0.3, 'semantic': 0.2})),
-            message=match_results.get('message')
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "task_id": task.id,
+                "status": "PENDING",
+                "status_url": f"{settings.API_V1_PREFIX}/jobs/{job_id}/match-candidates/{task.id}"
+            }
         )
         
     except HTTPException:
@@ -297,3 +304,25 @@ async def match_candidates_to_job(
             detail=f"Error during candidate matching: {str(e)}"
         )
 
+
+@router.get("/{job_id}/match-candidates/{task_id}")
+async def get_match_candidates_status(
+    job_id: UUID,
+    task_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Poll a queued matching run
+    
+    status is the Celery state; once it is SUCCESS, result holds the
+    MatchCandidatesResponse payload. Returns 404 for a task_id that was not
+    issued for this job.
+    """
+    if not is_match_task_for_job(task_id, job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Matching task not found for this job"
+        )
+    
+    # The result backend client is blocking
+    return await run_in_threadpool(task_status, task_id)
@@ -2,21 +2,23 @@
 Match results endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict
 from uuid import UUID
-from decimal import Decimal
-from app.database import get_db
+from app.database import get_async_db
 from app.models.match_result import MatchResult
-from app.models.user import User
 from app.schemas.match_result import (
     MatchResult as MatchResultSchema,
     MatchResultListResponse,
-    MatchResultFilter
+    MatchResultFilter,
+    result_cache_key
 )
 from app.core.dependencies import get_current_active_user
-from app.services.matching_orchestrator import matching_orchestrator
+from app.schemas.user import AuthenticatedUser
+from app.core.redis_client import cache_get, cache_set
 from app.services.audit_logger import audit_logger
 from pydantic import BaseModel, Field
 import logging
@@ -25,6 +27,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/results", tags=["results"])
 
+RESULT_CACHE_TTL = 300  # seconds; re-scoring evicts entries sooner
+
+# Columns of the MatchResult schema; list pages select them directly and serialize the rows as-is
+_RESULT_LIST_COLUMNS = (
+    MatchResult.id, MatchResult.job_id, MatchResult.candidate_id, MatchResult.scores_json,
+    MatchResult.overall_score, MatchResult.rank, MatchResult.explanation,
+    MatchResult.created_at, MatchResult.updated_at,
+)
+
 
 class MatchRequest(BaseModel):
     candidate_ids: Optional[List[UUID]] = None
@@ -34,55 +45,78 @@ class MatchRequest(BaseModel):
     enable_bias_detection: bool = True
 
 
-@router.get("", response_model=MatchResultListResponse)
+@router.get("", response_model=None, responses={200: {"model": MatchResultListResponse}})
 async def list_results(
     job_id: Optional[UUID] = Query(None, alias="job_id"),
-    min_score: Optional[Decimal] = Query(None, ge=0, le=100),
-    max_score: Optional[Decimal] = Query(None, ge=0, le=100),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    max_score: Optional[float] = Query(None, ge=0, le=100),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get ranked match results with filtering
     """
-    query = db.query(MatchResult)
+    query = select(*_RESULT_LIST_COLUMNS)
     
     # Filter by job_id
     if job_id:
-        query = query.filter(MatchResult.job_id == job_id)
+        query = query.where(MatchResult.job_id == job_id)
     
     # Filter by score range
     if min_score is not None:
-        query = query.filter(MatchResult.overall_score >= min_score)
+        query = query.where(MatchResult.overall_score >= min_score)
     if max_score is not None:
-        query = query.filter(MatchResult.overall_score <= max_score)
+        query = query.where(MatchResult.overall_score <= max_score)
     
-    # Get total count
-    total = query.count()
+    # Page (ordered by score, descending) and total in one round-trip:
+    # count(*) OVER () is evaluated before OFFSET/LIMIT
+    rows = (await db.execute(
+        query.add_columns(func.count().over().label('total'))
+        .order_by(desc(MatchResult.overall_score)).offset((page - 1) * page_size).limit(page_size)
+    )).all()
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page: no row carries the total, so count separately
+        total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    else:
+        total = 0
     
-    # Apply pagination and ordering by score (descending)
-    results = query.order_by(desc(MatchResult.overall_score)).offset((page - 1) * page_size).limit(page_size).all()
+    # Rows already have the MatchResultListResponse item shape; skip per-item model validation
+    results = []
+    for row in rows:
+        result = dict(row._mapping)
+        del result['total']
+        # Stored as float4; present the two decimals the schema serializer would
+        result['overall_score'] = round(result['overall_score'], 2)
+        results.append(result)
     
-    return MatchResultListResponse(
-        items=results,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return ORJSONResponse({
+        "items": results,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
 
 
 @router.get("/{result_id}", response_model=MatchResultSchema)
 async def get_result(
     result_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get a specific match result by ID
     """
-    result = db.query(MatchResult).filter(MatchResult.id == result_id).first()
+    cache_key = result_cache_key(result_id)
+    cached = await run_in_threadpool(cache_get, cache_key)
+    if cached:
+        # Already-serialized JSON: hand it straight back
+        return Response(content=cached, media_type="application/json")
+    
+    result = await db.get(MatchResult, result_id)
     
     if not result:
         raise HTTPException(
@@ -90,41 +124,43 @@ async def get_result(
             detail="Match result not found"
         )
     
-    return result
+    payload = MatchResultSchema.model_validate(result).model_dump_json()
+    await run_in_threadpool(cache_set, cache_key, payload, RESULT_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/job/{job_id}/ranked", response_model=MatchResultListResponse)
 async def get_ranked_results_for_job(
     job_id: UUID,
     limit: int = Query(10, ge=1, le=100),
-    min_score: Optional[Decimal] = Query(None, ge=0, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get ranked candidates for a specific job
     """
-    query = db.query(MatchResult).filter(MatchResult.job_id == job_id)
+    query = select(MatchResult).where(MatchResult.job_id == job_id)
     
     # Filter by minimum score if provided
     if min_score is not None:
-        query = query.filter(MatchResult.overall_score >= min_score)
+        query = query.where(MatchResult.overall_score >= min_score)
     
-    # Get results ordered by score (descending) and rank
-    results = query.order_by(
+    # Get results ordered by score (descending) and rank; ix_match_results_job_score_desc
+    # matches this order, so the top `limit` rows come straight off the index
+    results = (await db.execute(query.order_by(
         desc(MatchResult.overall_score),
         MatchResult.rank.asc()
-    ).limit(limit).all()
-    
-    # Update ranks if needed
-    for idx, result in enumerate(results, start=1):
-        if result.rank != str(idx):
-            result.rank = str(idx)
+    ).limit(limit))).scalars().all()
     
-    db.commit()
+    # Rank is positional within this response; a read must not write it back
+    items = [
+        MatchResultSchema.model_validate(result).model_copy(update={'rank': idx})
+        for idx, result in enumerate(results, start=1)
+    ]
     
     return MatchResultListResponse(
-        items=results,
+        items=items,
         total=len(results),
         page=1,
         page_size=limit
@@ -135,8 +171,8 @@ async def get_ranked_results_for_job(
 async def match_job_to_candidates(
     job_id: UUID,
     match_request: MatchRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Match a job to candidates using the matching orchestrator
@@ -157,7 +193,8 @@ async def match_job_to_candidates(
         # Convert candidate IDs to strings if provided
         candidate_ids = [str(cid) for cid in match_request.candidate_ids] if match_request.candidate_ids else None
         
-        # Execute matching
+        # Execute matching (imported here: the orchestrator loads the embedding model and FAISS)
+        from app.services.matching_orchestrator import matching_orchestrator
         results = matching_orchestrator.match_job_to_candidates(
             job_id=str(job_id),
             candidate_ids=candidate_ids,
@@ -2,55 +2,61 @@
 Resume management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from celery import group
+from sqlalchemy import desc, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
-from app.database import get_db
+from app.core.config import settings
+from app.database import get_async_db
 from app.models.resume import Resume, ResumeStatus
-from app.models.user import User
 from app.schemas.resume import Resume as ResumeSchema, ResumeListResponse, ResumeUploadResponse
 from app.core.dependencies import get_current_active_user
+from app.schemas.user import AuthenticatedUser
+from app.core.redis_client import cache_get, cache_set, cache_delete
 from app.services.file_service import file_service
-from app.tasks.resume_tasks import process_resume
+from app.tasks.resume_tasks import process_resume, resume_cache_key
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/resumes", tags=["resumes"])
 
+RESUME_CACHE_TTL = 300  # seconds; processing and delete evict entries sooner
+
+# Columns of the Resume schema; list pages select them directly and serialize the rows as-is
+_RESUME_LIST_COLUMNS = (
+    Resume.id, Resume.file_name, Resume.file_type, Resume.file_path, Resume.file_size,
+    Resume.parsed_data_json, Resume.status, Resume.uploaded_by, Resume.created_at, Resume.updated_at,
+)
+
 
 @router.post("/upload", response_model=ResumeSchema, status_code=status.HTTP_201_CREATED)
 async def upload_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Upload a resume file
     """
     try:
-        # Read file content
-        file_content = await file.read()
-        
-        if not file_content:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File is empty"
-            )
-        
         if not file.filename:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Filename is required"
             )
         
-        # Upload file
+        # Stream the spooled upload to storage in chunks rather than reading it into memory
         try:
-            file_path = file_service.upload_file(
-                file_content=file_content,
-                filename=file.filename,
-                user_id=str(current_user.id)
+            file_path, file_size = await run_in_threadpool(
+                file_service.upload_fileobj,
+                file.file,
+                file.filename,
+                str(current_user.id)
             )
         except ValueError as e:
             raise HTTPException(
@@ -71,7 +77,7 @@ async def upload_resume(
             new_resume = Resume(
                 file_path=file_path,
                 file_name=file.filename,
-                file_size=str(len(file_content)),
+                file_size=file_size,
                 file_type=file_ext,
                 status=ResumeStatus.UPLOADED,
                 uploaded_by=current_user.id
@@ -79,20 +85,20 @@ async def upload_resume(
             
             logger.info(f"Creating resume record: file_name={file.filename}, user_id={current_user.id}")
             db.add(new_resume)
-            db.flush()  # Flush to get the ID without committing
+            await db.flush()  # Flush to get the ID without committing
             
             logger.info(f"Resume record added to session, ID: {new_resume.id}")
             
             # Commit the transaction
-            db.commit()
+            await db.commit()
             logger.info(f"Resume record committed to database: {new_resume.id}")
             
             # Refresh to get all fields from database
-            db.refresh(new_resume)
+            await db.refresh(new_resume)
             logger.info(f"Resume record refreshed: {new_resume.id}, status={new_resume.status}")
             
         except Exception as db_error:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Database error creating resume: {str(db_error)}", exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -151,7 +157,7 @@ async def upload_resume(
         logger.error(f"❌ Unexpected error in upload_resume: {str(e)}", exc_info=True)
         # Rollback any pending database changes
         try:
-            db.rollback()
+            await db.rollback()
             logger.info("Database transaction rolled back due to error")
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {str(rollback_error)}")
@@ -161,36 +167,134 @@ async def upload_resume(
         )
 
 
-@router.get("", response_model=ResumeListResponse)
+@router.post("/upload-batch", response_model=List[ResumeSchema], status_code=status.HTTP_201_CREATED)
+async def upload_resumes_batch(
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Upload several resume files at once
+    
+    The batch is all-or-nothing: if any file is rejected, none are stored.
+    """
+    if len(files) > settings.MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BATCH_UPLOAD_FILES} files can be uploaded at once"
+        )
+    if any(not file.filename for file in files):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filename is required"
+        )
+    
+    user_id = str(current_user.id)
+    # Stream every file to storage concurrently
+    stored = await asyncio.gather(
+        *(run_in_threadpool(file_service.upload_fileobj, file.file, file.filename, user_id) for file in files),
+        return_exceptions=True
+    )
+    
+    failed = [(file, outcome) for file, outcome in zip(files, stored) if isinstance(outcome, Exception)]
+    if failed:
+        for outcome in stored:
+            if not isinstance(outcome, Exception):
+                await run_in_threadpool(file_service.delete_file, outcome[0])
+        file, error = failed[0]
+        logger.error(f"Batch upload rejected at {file.filename}: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST if isinstance(error, ValueError) else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{file.filename}: {str(error)}"
+        )
+    
+    # One multi-row INSERT ... RETURNING instead of add/flush/commit/refresh per file
+    rows = [
+        {
+            'file_path': file_path,
+            'file_name': file.filename,
+            'file_size': file_size,
+            'file_type': file.filename.split('.')[-1].lower() if '.' in file.filename else '',
+            'status': ResumeStatus.UPLOADED,
+            'uploaded_by': current_user.id,
+        }
+        for file, (file_path, file_size) in zip(files, stored)
+    ]
+    try:
+        new_resumes = (await db.scalars(insert(Resume).returning(Resume), rows)).all()
+        await db.commit()
+    except Exception as db_error:
+        await db.rollback()
+        for file_path, _ in stored:
+            await run_in_threadpool(file_service.delete_file, file_path)
+        logger.error(f"Database error creating resumes: {str(db_error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save resumes to database: {str(db_error)}"
+        )
+    
+    # Queue processing as one group publish (optional - don't fail if Celery is not available)
+    try:
+        await run_in_threadpool(group(process_resume.s(str(resume.id)) for resume in new_resumes).apply_async)
+        logger.info(f"Resume processing queued for {len(new_resumes)} resumes")
+    except Exception as e:
+        logger.warning(f"Failed to queue processing tasks (continuing anyway): {str(e)}")
+    
+    logger.info(f"{len(new_resumes)} resumes uploaded by user {current_user.email}")
+    return [ResumeSchema.model_validate(resume) for resume in new_resumes]
+
+
+@router.get("", response_model=None, responses={200: {"model": ResumeListResponse}})
 async def list_resumes(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     status_filter: ResumeStatus = Query(None, alias="status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    skill: Optional[str] = Query(None, description="Only resumes with this extracted skill"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     List all resumes with pagination and filtering
     """
     try:
-        query = db.query(Resume).filter(Resume.uploaded_by == current_user.id)
+        query = select(*_RESUME_LIST_COLUMNS).where(Resume.uploaded_by == current_user.id)
         
         # Filter by status if provided
         if status_filter:
-            query = query.filter(Resume.status == status_filter)
+            query = query.where(Resume.status == status_filter)
         
-        # Get total count
-        total = query.count()
+        # Containment (@>) is the only form ix_resumes_parsed_data_gin can serve
+        if skill:
+            query = query.where(
+                Resume.parsed_data_json.contains({'skills': {'skills': [skill.strip().lower()]}})
+            )
         
-        # Apply pagination
-        resumes = query.order_by(desc(Resume.created_at)).offset((page - 1) * page_size).limit(page_size).all()
+        # Page and total in one round-trip: count(*) OVER () is evaluated before OFFSET/LIMIT
+        rows = (await db.execute(
+            query.add_columns(func.count().over().label('total'))
+            .order_by(desc(Resume.created_at)).offset((page - 1) * page_size).limit(page_size)
+        )).all()
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # Past the last page: no row carries the total, so count separately
+            total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+        else:
+            total = 0
         
-        return ResumeListResponse(
-            items=resumes,
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        # Rows already have the ResumeListResponse item shape; skip per-item model validation
+        resumes = []
+        for row in rows:
+            resume = dict(row._mapping)
+            del resume['total']
+            resumes.append(resume)
+        
+        return ORJSONResponse({
+            "items": resumes,
+            "total": total,
+            "page": page,
+            "page_size": page_size
+        })
     except Exception as e:
         logger.error(f"Error listing resumes: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -202,13 +306,19 @@ async def list_resumes(
 @router.get("/{resume_id}", response_model=ResumeSchema)
 async def get_resume(
     resume_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Get a specific resume by ID
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    cache_key = resume_cache_key(resume_id)
+    cached = await run_in_threadpool(cache_get, cache_key)
+    if cached:
+        # Already-serialized JSON: hand it straight back
+        return Response(content=cached, media_type="application/json")
+    
+    resume = await db.get(Resume, resume_id)
     
     if not resume:
         raise HTTPException(
@@ -216,19 +326,21 @@ async def get_resume(
             detail="Resume not found"
         )
     
-    return resume
+    payload = ResumeSchema.model_validate(resume).model_dump_json()
+    await run_in_threadpool(cache_set, cache_key, payload, RESUME_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resume(
     resume_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """
     Delete a resume and its file
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     
     if not resume:
         raise HTTPException(
@@ -240,8 +352,9 @@ async def delete_resume(
     file_service.delete_file(resume.file_path)
     
     # Delete database record
-    db.delete(resume)
-    db.commit()
+    await db.delete(resume)
+    await db.commit()
+    await run_in_threadpool(cache_delete, resume_cache_key(resume_id))
     
     logger.info(f"Resume deleted: {resume_id} by user {current_user.email}")
 
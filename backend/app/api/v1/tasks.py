@@ -0,0 +1,42 @@
+"""
+Background Task Endpoints
+Poll the state/result of Celery tasks enqueued by other endpoints
+"""
+from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
+from celery.result import AsyncResult
+from app.celery_app import celery_app
+from app.core.dependencies import get_current_active_user
+from app.schemas.user import AuthenticatedUser
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+def task_status(task_id: str) -> dict:
+    """State of a Celery task, with its result or error once finished"""
+    result = AsyncResult(task_id, app=celery_app)
+    state = result.state
+    response = {"task_id": task_id, "status": state}
+    if state == "SUCCESS":
+        response["result"] = result.result
+    elif state == "FAILURE":
+        response["error"] = str(result.result)
+    return response
+
+
+@router.get("/{task_id}")
+async def get_task_status(
+    task_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Get the status of a background task
+    
+    status is the Celery state (PENDING, STARTED, SUCCESS, FAILURE, ...);
+    result/error are included once the task has finished.
+    """
+    # The result backend client is blocking
+    return await run_in_threadpool(task_status, task_id)
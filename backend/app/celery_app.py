@@ -1,12 +1,30 @@
 from celery import Celery
+from celery.signals import worker_process_init
+from kombu.serialization import register
 from app.core.config import settings
+import orjson
+
+# orjson codec for task and result payloads (faster than stdlib json, handles UUID/datetime natively)
+register(
+    "orjson",
+    lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
 
 # Create Celery instance
 celery_app = Celery(
     "resume_screening",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks"]
+    include=[
+        "app.tasks.resume_tasks",
+        "app.tasks.cleanup_tasks",
+        "app.tasks.interview_tasks",
+        "app.tasks.matching_tasks",
+        "app.tasks.model_tasks",
+    ]
 )
 
 # Celery configuration
@@ -21,10 +39,31 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
-    worker_prefetch_multiplier=1,
+    worker_prefetch_multiplier=1,  # Long matching tasks; the io worker raises it on its command line
     result_expires=3600,  # 1 hour
+    task_default_queue="maint",
 )
 
+# One queue per resource class, each consumed by its own worker pool:
+#   io       - resume parsing:   celery worker -Q io,maint -c 8 --prefetch-multiplier=4
+#   matching - BERT scoring:     celery worker -Q matching -c 1 (GPU host when available)
+#   maint    - periodic upkeep
+celery_app.conf.task_routes = {
+    "app.tasks.resume_tasks.*": {"queue": "io"},
+    "app.tasks.matching_tasks.*": {"queue": "matching"},
+    "app.tasks.cleanup_tasks.*": {"queue": "maint"},
+    "app.tasks.interview_tasks.*": {"queue": "maint"},
+    "app.tasks.model_tasks.*": {"queue": "maint"},
+}
+
+@worker_process_init.connect
+def warm_up_models(**kwargs):
+    """Load BERT in each worker process at boot rather than inside its first task"""
+    # Imported here: the API imports this module too and must not load the model
+    from app.ml.embeddings import embedding_generator
+    embedding_generator.warm_up()
+
+
 # Periodic task schedule (Celery Beat)
 celery_app.conf.beat_schedule = {
     "process-pending-resumes": {
@@ -35,5 +74,9 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.cleanup_tasks.cleanup_old_results",
         "schedule": 3600.0,  # Every hour
     },
+    "auto-update-interview-statuses": {
+        "task": "app.tasks.interview_tasks.auto_update_interview_statuses",
+        "schedule": 300.0,  # Every 5 minutes
+    },
 }
 
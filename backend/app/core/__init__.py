@@ -1,17 +1,34 @@
 # Core package
-from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
-from app.core.redis_client import get_redis_client, cache_get, cache_set, cache_delete, cache_exists
+# Attributes resolve lazily (PEP 562) so importing any app.core submodule, e.g.
+# app.core.config, does not also pull in passlib/bcrypt, jose and redis.
+from importlib import import_module
 
-__all__ = [
-    "settings",
-    "verify_password",
-    "get_password_hash",
-    "create_access_token",
-    "decode_access_token",
-    "get_redis_client",
-    "cache_get",
-    "cache_set",
-    "cache_delete",
-    "cache_exists",
-]
+_LAZY_ATTRS = {
+    "settings": "app.core.config",
+    "get_settings": "app.core.config",
+    "verify_password": "app.core.security",
+    "get_password_hash": "app.core.security",
+    "create_access_token": "app.core.security",
+    "decode_access_token": "app.core.security",
+    "get_redis_client": "app.core.redis_client",
+    "cache_get": "app.core.redis_client",
+    "cache_set": "app.core.redis_client",
+    "cache_delete": "app.core.redis_client",
+    "cache_delete_many": "app.core.redis_client",
+    "cache_exists": "app.core.redis_client",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
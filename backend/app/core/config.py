@@ -1,6 +1,8 @@
-from pydantic_settings import BaseSettings
-from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Dict, List, Optional
+from functools import lru_cache
 from urllib.parse import quote_plus
+import re
 from pydantic import computed_field
 
 
@@ -21,6 +23,20 @@ class Settings(BaseSettings):
     DB_PORT: int = 5433
     # DATABASE_URL will be computed from components to handle password encoding
     DATABASE_URL: Optional[str] = None
+    # asyncpg URL for AsyncSession endpoints; derived from DATABASE_URL when not set
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # pgvector HNSW search breadth (higher = better recall, lower QPS)
+    PGVECTOR_HNSW_EF_SEARCH: int = 40
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds; with TCP keepalives this replaces a per-checkout ping
+    # Server-side guard so a stuck "idle in transaction" session can't pin a pooled connection
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+    # Connecting through PgBouncer in transaction mode: PgBouncer pools, so the engines don't,
+    # and session state (SET, prepared statements) is not relied on. Set hnsw.ef_search and
+    # idle_in_transaction_session_timeout with ALTER ROLE/DATABASE instead.
+    DB_PGBOUNCER: bool = False
     
     # Redis
     REDIS_URL: Optional[str] = None  # Must be set via environment variable (e.g., redis://:password@host:port/db)
@@ -28,6 +44,8 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Optional[str] = None  # Must be set via environment variable
     REDIS_DB: int = 0
+    # TLS is used for rediss:// URLs; set this to force it for a redis:// URL
+    REDIS_SSL: bool = False
     
     # Security
     SECRET_KEY: Optional[str] = None  # Must be set via environment variable
@@ -62,14 +80,18 @@ class Settings(BaseSettings):
     SPACY_MODEL: str = "en_core_web_sm"
     SPACY_MODEL_PATH: str = "models/en_core_web_sm"
     USE_GPU: bool = False
+    # CPU-only: serve the sentence-transformer from an optimized, int8-quantized ONNX Runtime
+    # export (needs optimum[onnxruntime]); built on first load and cached at BERT_ONNX_MODEL_PATH
+    BERT_ONNX_ENABLED: bool = False
+    BERT_ONNX_MODEL_PATH: str = "models/onnx/all-MiniLM-L6-v2"
     ML_CACHE_TTL: int = 3600
     
     # Celery Configuration
     CELERY_BROKER_URL: Optional[str] = None  # Must be set via environment variable (defaults to REDIS_URL if not set)
     CELERY_RESULT_BACKEND: Optional[str] = None  # Must be set via environment variable (defaults to REDIS_URL if not set)
-    CELERY_TASK_SERIALIZER: str = "json"
-    CELERY_RESULT_SERIALIZER: str = "json"
-    CELERY_ACCEPT_CONTENT: List[str] = ["json"]
+    CELERY_TASK_SERIALIZER: str = "orjson"  # Registered in app/celery_app.py
+    CELERY_RESULT_SERIALIZER: str = "orjson"
+    CELERY_ACCEPT_CONTENT: List[str] = ["orjson", "json"]
     CELERY_TIMEZONE: str = "UTC"
     CELERY_ENABLE_UTC: bool = True
     CELERY_WORKER_CONCURRENCY: int = 4
@@ -86,6 +108,7 @@ class Settings(BaseSettings):
     
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
+    MAX_BATCH_UPLOAD_FILES: int = 50
     ALLOWED_EXTENSIONS: List[str] = ["pdf", "doc", "docx", "txt"]
     UPLOAD_DIR: str = "uploads"
     
@@ -101,9 +124,9 @@ class Settings(BaseSettings):
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Frozen: values are read from the environment once and never reassigned at runtime.
+    # model_post_init fills the derived URLs with object.__setattr__, which bypasses the freeze.
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
     
     def model_post_init(self, __context):
         # Always recompute DATABASE_URL from components to ensure proper password encoding
@@ -112,13 +135,15 @@ class Settings(BaseSettings):
         
         # Use DATABASE_URL from env if provided, otherwise construct from components
         if self.DATABASE_URL:
-            pass  # Already set from environment
+            pass  # Already set from environment; skip the encode/format work
         elif self.DB_PASSWORD:
             db_host = "localhost" if self.DB_HOST == "postgres" and not self.ENVIRONMENT == "docker" else self.DB_HOST
-            encoded_password = quote_plus(self.DB_PASSWORD)
-            computed_url = f"postgresql://{self.DB_USER}:{encoded_password}@{db_host}:{self.DB_PORT}/{self.DB_NAME}"
+            computed_url = _compute_db_url(self.DB_USER, self.DB_PASSWORD, db_host, self.DB_PORT, self.DB_NAME)
             object.__setattr__(self, 'DATABASE_URL', computed_url)
         
+        if not self.ASYNC_DATABASE_URL and self.DATABASE_URL:
+            object.__setattr__(self, 'ASYNC_DATABASE_URL', to_async_database_url(self.DATABASE_URL))
+        
         # Set default Celery URLs from REDIS_URL if not explicitly set
         if not self.CELERY_BROKER_URL and self.REDIS_URL:
             object.__setattr__(self, 'CELERY_BROKER_URL', self.REDIS_URL)
@@ -126,5 +151,37 @@ class Settings(BaseSettings):
             object.__setattr__(self, 'CELERY_RESULT_BACKEND', self.REDIS_URL)
 
 
-settings = Settings()
+@lru_cache(maxsize=8)
+def _compute_db_url(user: str, password: str, host: str, port: int, name: str) -> str:
+    """Build the postgres URL from its components, percent-encoding the password"""
+    return f"postgresql://{user}:{quote_plus(password)}@{host}:{port}/{name}"
+
+
+def to_async_database_url(url: str) -> str:
+    """Rewrite a postgres:// / postgresql[+driver]:// URL to use the asyncpg driver"""
+    return re.sub(r'^postgres(?:ql)?(?:\+\w+)?://', 'postgresql+asyncpg://', url)
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """
+    Pick pgvector HNSW build/search parameters for the given number of vectors.
+    Larger graphs need more neighbours per node and a wider candidate list
+    to keep recall steady as the index grows.
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 16, "ef_construction": 128, "ef_search": 100}
+    if vector_count < 10_000_000:
+        return {"m": 24, "ef_construction": 200, "ef_search": 200}
+    return {"m": 32, "ef_construction": 256, "ef_search": 400}
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build Settings once per process (env/.env parsing and model_post_init run only here)"""
+    return Settings()
+
+
+settings = get_settings()
 
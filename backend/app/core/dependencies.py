@@ -1,22 +1,42 @@
 """
 Dependencies for FastAPI routes
 """
+from typing import Optional
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.core.security import decode_access_token
-from app.schemas.user import TokenData
+from app.schemas.user import AuthenticatedUser, TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Authenticated users keyed by token subject (email). Nearly every request re-reads the
+# same users row; the TTL bounds how long a deactivation can take to be noticed.
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Only what handlers (and /auth/me) read; the password hash never enters the cache
+_AUTH_USER_COLUMNS = (
+    User.id, User.email, User.is_active, User.is_superuser, User.created_at, User.updated_at,
+)
+
+
+def invalidate_cached_user(email: Optional[str] = None) -> None:
+    """Drop one cached user (e.g. after an update/deactivation), or all when email is None"""
+    if email is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(email, None)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
     """
     Get current authenticated user from JWT token
     """
@@ -39,22 +59,34 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    user = _user_cache.get(token_data.email)
+    if user is not None:
+        return user
+    
+    row = (await db.execute(
+        select(*_AUTH_USER_COLUMNS).where(User.email == token_data.email)
+    )).first()
+    # The handler shares this session; end the transaction the SELECT autobegan so
+    # handlers that open their own (db.begin()) don't find one already in progress
+    await db.rollback()
+    if row is None:
         raise credentials_exception
     
+    user = AuthenticatedUser(**row._mapping)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
     
+    _user_cache[token_data.email] = user
     return user
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     Get current active user
     """
@@ -67,8 +99,8 @@ async def get_current_active_user(
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+) -> AuthenticatedUser:
     """
     Get current superuser
     """
@@ -1,4 +1,5 @@
 import redis
+from urllib.parse import urlparse
 from app.core.config import settings
 import logging
 
@@ -13,31 +14,28 @@ def get_redis_client() -> redis.Redis:
     global _redis_client
     if _redis_client is None:
         try:
-            # Redis Labs typically requires SSL
-            # Try with SSL first, fallback to non-SSL if needed
-            try:
-                _redis_client = redis.from_url(
-                    settings.REDIS_URL.replace("redis://", "rediss://"),  # Use rediss:// for SSL
+            # Decide TLS from the URL scheme (or REDIS_SSL) instead of probing with a TLS handshake
+            use_ssl = settings.REDIS_SSL or urlparse(settings.REDIS_URL).scheme == "rediss"
+            if use_ssl:
+                client = redis.from_url(
+                    settings.REDIS_URL.replace("redis://", "rediss://", 1),
                     decode_responses=True,
                     socket_connect_timeout=10,
                     socket_timeout=10,
                     retry_on_timeout=True,
                     ssl_cert_reqs=None  # Redis Labs uses self-signed certs
                 )
-                _redis_client.ping()
-                logger.info("Redis client connected successfully with SSL")
-            except Exception as ssl_error:
-                logger.info(f"SSL connection failed, trying without SSL: {str(ssl_error)}")
-                # Fallback to non-SSL
-                _redis_client = redis.from_url(
+            else:
+                client = redis.from_url(
                     settings.REDIS_URL,
                     decode_responses=True,
                     socket_connect_timeout=10,
                     socket_timeout=10,
                     retry_on_timeout=True
                 )
-                _redis_client.ping()
-                logger.info("Redis client connected successfully without SSL")
+            client.ping()
+            _redis_client = client
+            logger.info(f"Redis client connected successfully ({'with' if use_ssl else 'without'} SSL)")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {str(e)}")
             raise
@@ -54,10 +52,12 @@ def close_redis_client():
 
 
 # Cache utility functions
+# These read the bound client directly and only call get_redis_client() to create it,
+# so close_redis_client() still takes effect on the next call.
 def cache_get(key: str) -> str:
     """Get value from cache"""
     try:
-        client = get_redis_client()
+        client = _redis_client or get_redis_client()
         return client.get(key)
     except Exception as e:
         logger.error(f"Cache get error for key {key}: {str(e)}")
@@ -67,7 +67,7 @@ def cache_get(key: str) -> str:
 def cache_set(key: str, value: str, ttl: int = None):
     """Set value in cache with optional TTL"""
     try:
-        client = get_redis_client()
+        client = _redis_client or get_redis_client()
         if ttl:
             client.setex(key, ttl, value)
         else:
@@ -79,16 +79,27 @@ def cache_set(key: str, value: str, ttl: int = None):
 def cache_delete(key: str):
     """Delete key from cache"""
     try:
-        client = get_redis_client()
+        client = _redis_client or get_redis_client()
         client.delete(key)
     except Exception as e:
         logger.error(f"Cache delete error for key {key}: {str(e)}")
 
 
+def cache_delete_many(keys: list):
+    """Delete several keys from cache in one round-trip"""
+    if not keys:
+        return
+    try:
+        client = _redis_client or get_redis_client()
+        client.delete(*keys)
+    except Exception as e:
+        logger.error(f"Cache delete error for {len(keys)} keys: {str(e)}")
+
+
 def cache_exists(key: str) -> bool:
     """Check if key exists in cache"""
     try:
-        client = get_redis_client()
+        client = _redis_client or get_redis_client()
         return client.exists(key) > 0
     except Exception as e:
         logger.error(f"Cache exists error for key {key}: {str(e)}")
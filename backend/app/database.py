@@ -1,22 +1,74 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
 # SQLAlchemy 2.0 Base class
 class Base(DeclarativeBase):
     pass
 
+if settings.DB_PGBOUNCER:
+    # PgBouncer (transaction mode) owns the pool; a client-side pool would only pin server slots
+    _pool_options = {"poolclass": NullPool}
+    # asyncpg's prepared statements are per server connection, which PgBouncer swaps between transactions
+    _async_connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+else:
+    # No pool_pre_ping: it costs a SELECT 1 round-trip on every checkout. Dead connections
+    # are caught by TCP keepalives (sync engine) and connections are recycled periodically.
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    _async_connect_args = {}
+
+# libpq TCP keepalives: detect a dropped server/NAT entry within ~80s of idleness
+_sync_connect_args = {"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10, "keepalives_count": 5}
+
 # Create engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **_pool_options,
+    connect_args=_sync_connect_args,
+    query_cache_size=1200,  # room for the per-endpoint statement variants (default 500)
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
+
+def _set_session_params(dbapi_connection, connection_record):
+    """Apply per-session settings (pgvector search knobs, idle timeout) once per pooled connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET hnsw.ef_search = {int(settings.PGVECTOR_HNSW_EF_SEARCH)}")
+        cursor.execute(
+            f"SET idle_in_transaction_session_timeout = {int(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)}"
+        )
+    finally:
+        cursor.close()
+    # Commit so the SET survives the pool's rollback-on-return
+    dbapi_connection.commit()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for endpoints that should not block the event loop on DB I/O.
+# The sync engine above stays in use for Celery tasks and sync services.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **_pool_options,
+    connect_args=_async_connect_args,
+    query_cache_size=1200,
+    echo=settings.DEBUG,
+)
+
+# Session-level SETs don't stick to a client behind a transaction-mode PgBouncer
+if not settings.DB_PGBOUNCER:
+    event.listen(engine, "connect", _set_session_params)
+    event.listen(async_engine.sync_engine, "connect", _set_session_params)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -27,108 +79,95 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Bump whenever init_db's table/extension setup changes so existing databases re-run it
+_SCHEMA_VERSION = "1.0.0"
+
+
 def init_db():
-    """Initialize database - create tables and enable pgvector"""
+    """
+    Initialize database - create tables and enable pgvector.
+    Raises if the setup transaction fails (everything in it is rolled back).
+    """
     from sqlalchemy import text
     from app.models.user import User
     from app.models.job import Job
     from app.models.resume import Resume
     
-    # Create users table first (doesn't require pgvector)
+    # Warm restarts: one SELECT instead of the extension/table probes below
     try:
-        User.metadata.create_all(bind=engine, tables=[User.__table__])
-        print("✅ Users table created/verified")
-    except Exception as e:
-        print(f"Note: Users table setup: {str(e)}")
-    
-    # Create jobs table (doesn't require pgvector)
-    try:
-        Job.metadata.create_all(bind=engine, tables=[Job.__table__])
-        print("✅ Jobs table created/verified")
-    except Exception as e:
-        print(f"Note: Jobs table setup: {str(e)}")
+        with engine.connect() as conn:
+            current_version = conn.execute(
+                text("SELECT value FROM app_meta WHERE key = 'schema_version'")
+            ).scalar()
+        if current_version == _SCHEMA_VERSION:
+            print(f"✅ Database schema {_SCHEMA_VERSION} already initialized")
+            return
+    except Exception:
+        pass  # First start: app_meta doesn't exist yet
     
-    # Try to create resumes table - handle vector type gracefully
+    # All setup runs in one transaction: a single BEGIN/COMMIT, and a failure leaves nothing half-built
     try:
-        # First try to enable pgvector extension
-        with engine.connect() as conn:
+        with engine.begin() as conn:
+            # pgvector is optional; the savepoint keeps a failed CREATE EXTENSION from aborting the transaction
             try:
-                conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-                conn.commit()
+                with conn.begin_nested():
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                pgvector_available = True
                 print("✅ pgvector extension enabled")
             except Exception as e:
+                pgvector_available = False
                 print(f"Note: pgvector extension not available: {str(e)}")
-        
-        # Try to create resumes table
-        Resume.metadata.create_all(bind=engine, tables=[Resume.__table__])
-        print("✅ Resumes table created/verified")
-    except Exception as e:
-        # If vector type doesn't exist, create table without vector column
-        if "vector" in str(e).lower():
-            print(f"Note: Creating resumes table without vector column (pgvector not available)")
-            try:
-                # Create a simplified version without vector column
-                with engine.connect() as conn:
-                    # First create the enum type if it doesn't exist
-                    conn.execute(text("""
-                        DO $$ BEGIN
-                            CREATE TYPE resumestatus AS ENUM ('uploaded', 'parsing', 'parsed', 'processing', 'processed', 'error');
-                        EXCEPTION
-                            WHEN duplicate_object THEN null;
-                        END $$;
-                    """))
-                    
-                    # Check if table exists
-                    table_exists = conn.execute(text("""
-                        SELECT EXISTS (
-                            SELECT FROM information_schema.tables 
-                            WHERE table_schema = 'public' 
-                            AND table_name = 'resumes'
-                        )
-                    """)).scalar()
-                    
-                    if not table_exists:
-                        # Create the table with JSONB embedding_vector (instead of vector type)
-                        conn.execute(text("""
-                            CREATE TABLE resumes (
-                                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                                file_path VARCHAR(512) NOT NULL,
-                                file_name VARCHAR(255) NOT NULL,
-                                file_size VARCHAR(50),
-                                file_type VARCHAR(50) NOT NULL,
-                                parsed_data_json JSONB,
-                                embedding_vector JSONB,
-                                status resumestatus NOT NULL DEFAULT 'uploaded',
-                                uploaded_by UUID NOT NULL REFERENCES users(id),
-                                created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
-                                updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
-                            )
-                        """))
-                        print("✅ Resumes table created (with JSONB embedding_vector and enum type)")
-                    else:
-                        # Table exists, check if embedding_vector column exists
-                        col_exists = conn.execute(text("""
-                            SELECT EXISTS (
-                                SELECT FROM information_schema.columns 
-                                WHERE table_schema = 'public' 
-                                AND table_name = 'resumes' 
-                                AND column_name = 'embedding_vector'
-                            )
-                        """)).scalar()
-                        
-                        if not col_exists:
-                            # Add embedding_vector as JSONB
-                            conn.execute(text("ALTER TABLE resumes ADD COLUMN embedding_vector JSONB"))
-                            print("✅ Added embedding_vector column as JSONB")
-                    
-                    conn.commit()
-            except Exception as create_error:
-                print(f"Error creating resumes table: {str(create_error)}")
-        else:
-            print(f"Error creating resumes table: {str(e)}")
-    
-    # Create all other tables (if any)
-    try:
-        Base.metadata.create_all(bind=engine)
+            
+            if not pgvector_available:
+                # Resumes without the vector type: JSONB embedding_vector, created ahead of
+                # create_all (which then skips it). Users first, for the uploaded_by FK.
+                Base.metadata.create_all(bind=conn, tables=[User.__table__, Job.__table__])
+                conn.exec_driver_sql("""
+                    DO $$ BEGIN
+                        CREATE TYPE resumestatus AS ENUM ('uploaded', 'parsing', 'parsed', 'processing', 'processed', 'error');
+                    EXCEPTION
+                        WHEN duplicate_object THEN null;
+                    END $$;
+                    CREATE TABLE IF NOT EXISTS resumes (
+                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                        file_path VARCHAR(512) NOT NULL,
+                        file_name VARCHAR(255) NOT NULL,
+                        file_size BIGINT,
+                        file_type VARCHAR(50) NOT NULL,
+                        parsed_data_json JSONB,
+                        embedding_vector JSONB,
+                        status resumestatus NOT NULL DEFAULT 'uploaded',
+                        uploaded_by UUID NOT NULL REFERENCES users(id),
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+                    );
+                    ALTER TABLE resumes ADD COLUMN IF NOT EXISTS embedding_vector JSONB;
+                """)
+                print("✅ Resumes table created/verified (with JSONB embedding_vector)")
+            
+            # Remaining tables; existing ones are skipped
+            Base.metadata.create_all(bind=conn)
+            print("✅ Tables created/verified")
+            
+            # Record the schema version for the early exit above
+            conn.exec_driver_sql(
+                "CREATE TABLE IF NOT EXISTS app_meta (key VARCHAR(64) PRIMARY KEY, value VARCHAR(255) NOT NULL)"
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO app_meta (key, value) VALUES ('schema_version', :version) "
+                    "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value"
+                ),
+                {"version": _SCHEMA_VERSION}
+            )
     except Exception as e:
-        print(f"Note: Some tables may require pgvector extension: {str(e)}")
+        # Rolled back as a whole, so the next start retries from scratch; raise so callers
+        # (the app lifespan) report the failure instead of a successful initialization
+        print(f"Error initializing database schema: {str(e)}")
+        raise
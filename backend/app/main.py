@@ -1,35 +1,74 @@
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.concurrency import run_in_threadpool
+from app.celery_app import celery_app
 from app.core.config import settings
-from app.database import engine
-from sqlalchemy import text
-import redis
+from app.core.redis_client import get_redis_client
+from app.database import async_engine, engine, init_db
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+import asyncio
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Settings read by the probes and exception handlers, resolved once at import
+DEBUG = settings.DEBUG
+ENVIRONMENT = settings.ENVIRONMENT
+VERSION = settings.VERSION
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and connect Redis concurrently on startup"""
+    logger.info(f"CORS allowed origins: {cors_origins}")
+    logger.info(f"Environment: {ENVIRONMENT}, Debug: {DEBUG}")
+    # Both are blocking; run them side by side so startup takes the longer of the two, not the sum
+    db_result, redis_result = await asyncio.gather(
+        asyncio.to_thread(init_db),
+        asyncio.to_thread(get_redis_client),
+        return_exceptions=True,
+    )
+    if isinstance(db_result, Exception):
+        logger.error(f"Database initialization error: {str(db_result)}", exc_info=db_result)
+    else:
+        logger.info("Database initialized successfully")
+    if isinstance(redis_result, Exception):
+        logger.error(f"Redis connection error: {str(redis_result)}")
+    yield
+
+
 app = FastAPI(
     title="Resume Screening System API",
     description="AI-powered resume screening and candidate evaluation system",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware - must be added before other middleware
 # For development, allow all origins if needed, but prefer explicit list
-cors_origins = settings.CORS_ORIGINS
-if settings.DEBUG or settings.ENVIRONMENT == "development":
-    # In development, also allow 127.0.0.1 variants
-    cors_origins = list(set(cors_origins + [
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://localhost:3001",
-        "http://127.0.0.1:3001",
-    ]))
+# In development, also allow 127.0.0.1 variants
+_DEV_CORS_ORIGINS = (
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "http://localhost:3001",
+    "http://127.0.0.1:3001",
+)
+# Frozen at import: an ordered, de-duplicated tuple for the middleware (and startup log),
+# and a set for the per-error membership test
+cors_origins = tuple(dict.fromkeys([
+    *settings.CORS_ORIGINS,
+    *(_DEV_CORS_ORIGINS if DEBUG or ENVIRONMENT == "development" else ()),
+]))
+CORS_ORIGINS_SET = frozenset(cors_origins)
+# "*" lets CORSMiddleware accept any origin; mirror that in the error handlers without a lookup
+_ALLOW_ALL_ORIGINS = "*" in CORS_ORIGINS_SET
 
 app.add_middleware(
     CORSMiddleware,
@@ -52,18 +91,23 @@ app.add_middleware(
 )
 
 
+# CORS headers for error responses; only Access-Control-Allow-Origin varies per request
+_CORS_BASE_HEADERS = {
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH, HEAD",
+    "Access-Control-Allow-Headers": "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, Origin",
+}
+# Shared by every disallowed/missing origin; responses copy headers, so it is never mutated
+_NO_CORS_HEADERS = {}
+
+
 # Helper function to get CORS headers
 def get_cors_headers(request: Request) -> dict:
     """Get appropriate CORS headers based on the request origin"""
     origin = request.headers.get("origin")
-    if origin and origin in cors_origins:
-        return {
-            "Access-Control-Allow-Origin": origin,
-            "Access-Control-Allow-Credentials": "true",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH, HEAD",
-            "Access-Control-Allow-Headers": "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, Origin",
-        }
-    return {}
+    if origin and (_ALLOW_ALL_ORIGINS or origin in CORS_ORIGINS_SET):
+        return {"Access-Control-Allow-Origin": origin, **_CORS_BASE_HEADERS}
+    return _NO_CORS_HEADERS
 
 
 # Global exception handlers to ensure CORS headers are always present
@@ -71,7 +115,7 @@ def get_cors_headers(request: Request) -> dict:
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions with CORS headers"""
     headers = get_cors_headers(request)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
         headers=headers
@@ -82,7 +126,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with CORS headers"""
     headers = get_cors_headers(request)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()},
         headers=headers
@@ -94,7 +138,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions with CORS headers"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
     headers = get_cors_headers(request)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"},
         headers=headers
@@ -108,56 +152,84 @@ async def root():
         "message": "Welcome to Resume Screening System API",
         "version": "1.0.0",
         "docs": "/docs",
-        "environment": settings.ENVIRONMENT
+        "environment": ENVIRONMENT
     }
 
 
+# Sent straight to the driver: no SQLAlchemy compile step or statement-cache lookup per probe
+_PING = "SELECT 1"
+# Static parts of the probe bodies; /health copies its skeleton, /health/ready returns its body as-is
+_HEALTH_SKELETON = {"status": "healthy", "version": VERSION, "environment": ENVIRONMENT}
+_READY_BODY = {"status": "ready"}
+# Bursts of /health probes inside this window share one database round-trip
+_db_health_cache = TTLCache(maxsize=1, ttl=2)
+
+
+def _database_health() -> str:
+    """'connected' or 'disconnected', cached briefly in _db_health_cache"""
+    state = _db_health_cache.get("database")
+    if state is None:
+        try:
+            with engine.connect() as conn:
+                conn.exec_driver_sql(_PING)
+            state = "connected"
+        except Exception as e:
+            logger.error(f"Database health check failed: {str(e)}")
+            state = "disconnected"
+        _db_health_cache["database"] = state
+    return state
+
+
+# inspect().active() broadcasts to every worker and waits for replies, so run it at most once per window
+_celery_health_cache = TTLCache(maxsize=1, ttl=10)
+_celery_health_lock = threading.Lock()
+
+
+def _celery_health() -> tuple:
+    """(state, active worker count), cached in _celery_health_cache"""
+    with _celery_health_lock:
+        cached = _celery_health_cache.get("celery")
+        if cached is not None:
+            return cached
+        try:
+            active_workers = celery_app.control.inspect().active()
+            result = ("connected", len(active_workers)) if active_workers else ("no_workers", 0)
+        except Exception as e:
+            logger.error(f"Celery health check failed: {str(e)}")
+            result = ("disconnected", 0)
+        _celery_health_cache["celery"] = result
+        return result
+
+
 @app.get("/health")
 async def health_check():
     """Comprehensive health check endpoint"""
-    health_status = {
-        "status": "healthy",
-        "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
-    }
+    health_status = _HEALTH_SKELETON.copy()
     
     # Check database connection
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        health_status["database"] = "connected"
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
-        health_status["database"] = "disconnected"
+    health_status["database"] = _database_health()
+    if health_status["database"] != "connected":
         health_status["status"] = "unhealthy"
     
     # Check Redis connection
     try:
-        redis_client = redis.from_url(settings.REDIS_URL)
-        redis_client.ping()
+        # Shared client: one PING on a pooled connection rather than a new pool per probe
+        get_redis_client().ping()
         health_status["redis"] = "connected"
     except Exception as e:
         logger.error(f"Redis health check failed: {str(e)}")
         health_status["redis"] = "disconnected"
         health_status["status"] = "unhealthy"
     
-    # Check Celery worker
-    try:
-        from app.celery_app import celery_app
-        inspect = celery_app.control.inspect()
-        active_workers = inspect.active()
-        if active_workers:
-            health_status["celery"] = "connected"
-            health_status["celery_workers"] = len(active_workers)
-        else:
-            health_status["celery"] = "no_workers"
-    except Exception as e:
-        logger.error(f"Celery health check failed: {str(e)}")
-        health_status["celery"] = "disconnected"
+    # Check Celery worker (the broadcast blocks, so keep it off the event loop)
+    celery_state, worker_count = await run_in_threadpool(_celery_health)
+    health_status["celery"] = celery_state
+    if celery_state == "connected":
+        health_status["celery_workers"] = worker_count
     
     status_code = status.HTTP_200_OK if health_status["status"] == "healthy" else status.HTTP_503_SERVICE_UNAVAILABLE
     
-    return JSONResponse(content=health_status, status_code=status_code)
+    return ORJSONResponse(content=health_status, status_code=status_code)
 
 
 @app.get("/health/live")
@@ -170,39 +242,24 @@ async def liveness_check():
 async def readiness_check():
     """Kubernetes readiness probe"""
     try:
-        # Check database
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        # Check database (asyncpg, so the probe doesn't block the event loop)
+        async with async_engine.connect() as conn:
+            await conn.exec_driver_sql(_PING)
         
-        # Check Redis
-        redis_client = redis.from_url(settings.REDIS_URL)
-        redis_client.ping()
+        # Check Redis; the shared client is synchronous, so ping from the threadpool
+        await run_in_threadpool(lambda: get_redis_client().ping())
         
-        return {"status": "ready"}
+        return _READY_BODY
     except Exception as e:
         logger.error(f"Readiness check failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             content={"status": "not_ready", "error": str(e)},
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE
         )
 
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on application startup"""
-    logger.info(f"CORS allowed origins: {cors_origins}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}, Debug: {settings.DEBUG}")
-    try:
-        from app.database import init_db
-        init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Database initialization error: {str(e)}", exc_info=True)
-
-
 # Include routers
-from app.api.v1 import auth, jobs, resumes, results, interviews, candidates as candidates_api
+from app.api.v1 import auth, jobs, resumes, results, interviews, candidates as candidates_api, tasks
 
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(jobs.router, prefix=settings.API_V1_PREFIX)
@@ -210,4 +267,5 @@ app.include_router(resumes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(results.router, prefix=settings.API_V1_PREFIX)
 app.include_router(interviews.router, prefix=settings.API_V1_PREFIX)
 app.include_router(candidates_api.router, prefix=settings.API_V1_PREFIX)
+app.include_router(tasks.router, prefix=settings.API_V1_PREFIX)
 
@@ -2,14 +2,124 @@
 BERT Embeddings and TF-IDF Vectorizer for semantic similarity
 """
 import logging
+import math
+import pickle
 import numpy as np
+from datetime import datetime
+from pathlib import Path
+from scipy import sparse
 from typing import List, Optional, Union
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer
 import torch
+from app.core.config import settings
+from app.ml.model_registry import model_registry
+
+# Try to import SimSIMD (runtime-dispatched SIMD distance kernels), fallback to NumPy
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+# Try to import Optimum's ONNX Runtime integration, fallback to PyTorch inference
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Characters kept per token of the model's max_seq_length before tokenizing; WordPiece
+# averages well under this, so trimming never drops text the model would have seen
+CHARS_PER_TOKEN_BOUND = 10
+
+# Default texts per forward pass: large enough to keep a GPU's tensor cores busy, small on CPU
+GPU_BATCH_SIZE = 128
+CPU_BATCH_SIZE = 32
+
+BERT_MODEL_NAME = "all-MiniLM-L6-v2"  # Lightweight and fast
+ONNX_MODEL_FILE = "model_optimized_quantized.onnx"
+
+
+class OnnxSentenceEncoder:
+    """
+    ONNX Runtime stand-in for SentenceTransformer(BERT_MODEL_NAME) on CPU.
+    Reproduces its pipeline (mean pooling over tokens, then L2 normalization) and
+    the subset of encode() that EmbeddingGenerator uses.
+    """
+    
+    def __init__(self, model, tokenizer, max_seq_length: int = 256):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_seq_length = max_seq_length
+    
+    @classmethod
+    def load(cls, model_dir: str) -> "OnnxSentenceEncoder":
+        """Load the quantized export from model_dir, building it there on first use"""
+        model_path = Path(model_dir)
+        if not (model_path / ONNX_MODEL_FILE).exists():
+            cls._export(model_path)
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            model_path, file_name=ONNX_MODEL_FILE, provider="CPUExecutionProvider"
+        )
+        return cls(model, AutoTokenizer.from_pretrained(model_path))
+    
+    @staticmethod
+    def _export(model_path: Path) -> None:
+        """Export to ONNX, apply all graph optimizations, then int8 dynamic quantization (VNNI)"""
+        logger.info(f"Building ONNX model for {BERT_MODEL_NAME} in {model_path}")
+        hub_id = f"sentence-transformers/{BERT_MODEL_NAME}"
+        optimized_path = model_path / "optimized"
+        
+        model = ORTModelForFeatureExtraction.from_pretrained(hub_id, export=True)
+        ORTOptimizer.from_pretrained(model).optimize(
+            save_dir=optimized_path,
+            optimization_config=OptimizationConfig(optimization_level=99)
+        )
+        ORTQuantizer.from_pretrained(optimized_path, file_name="model_optimized.onnx").quantize(
+            save_dir=model_path,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        )
+        AutoTokenizer.from_pretrained(hub_id).save_pretrained(model_path)
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Embed one text (1-D result) or a list (2-D, input order), like SentenceTransformer.encode"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        # Longest first, as SentenceTransformer does, so each batch pads to similar lengths
+        order = np.argsort([-len(text) for text in sentences], kind='stable')
+        embeddings = [None] * len(sentences)
+        for start in range(0, len(sentences), batch_size):
+            batch_idx = order[start:start + batch_size]
+            features = self.tokenizer(
+                [sentences[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            token_embeddings = self.model(**features).last_hidden_state
+            mask = features["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for i, embedding in zip(batch_idx, pooled.astype(np.float32)):
+                embeddings[i] = embedding
+        
+        result = np.stack(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+        return result[0] if single else result
+
 
 class EmbeddingGenerator:
     """Generate embeddings for text using BERT and TF-IDF"""
@@ -25,32 +135,87 @@ class EmbeddingGenerator:
         # Initialize BERT (lazy loading)
         self._bert_loaded = False
     
+    @staticmethod
+    def _new_tfidf_vectorizer() -> TfidfVectorizer:
+        """Unfitted TF-IDF vectorizer with the project's settings"""
+        return TfidfVectorizer(
+            max_features=5000,
+            ngram_range=(1, 2),
+            stop_words='english',
+            min_df=2,
+            max_df=0.95,
+            dtype=np.float32
+        )
+    
     def _init_tfidf(self) -> None:
-        """Initialize TF-IDF vectorizer"""
+        """Initialize TF-IDF vectorizer from the active registered version (see fit_tfidf)"""
         try:
-            self.tfidf_vectorizer = TfidfVectorizer(
-                max_features=5000,
-                ngram_range=(1, 2),
-                stop_words='english',
-                min_df=2,
-                max_df=0.95
-            )
-            logger.info("TF-IDF vectorizer initialized")
+            self.tfidf_vectorizer = model_registry.load_pickle('tfidf')
+            if self.tfidf_vectorizer is not None:
+                logger.info(f"TF-IDF vectorizer loaded (version {model_registry.get_active_version('tfidf')})")
+                return
+        except Exception as e:
+            logger.error(f"Error loading fitted TF-IDF vectorizer: {str(e)}")
+        
+        try:
+            self.tfidf_vectorizer = self._new_tfidf_vectorizer()
+            logger.info("TF-IDF vectorizer initialized (not fitted; run fit_tfidf to enable TF-IDF embeddings)")
         except Exception as e:
             logger.error(f"Error initializing TF-IDF: {str(e)}")
     
+    def _tfidf_fitted(self) -> bool:
+        return self.tfidf_vectorizer is not None and hasattr(self.tfidf_vectorizer, 'vocabulary_')
+    
+    def fit_tfidf(self, corpus: List[str], version: Optional[str] = None) -> str:
+        """
+        Fit a TF-IDF vectorizer offline, register it as the active 'tfidf' version and use it
+        
+        Args:
+            corpus: Training texts
+            version: Version label (defaults to a timestamp)
+            
+        Returns:
+            The registered version
+        """
+        version = version or datetime.now().strftime("%Y%m%d%H%M%S")
+        vectorizer = self._new_tfidf_vectorizer().fit(corpus)
+        
+        model_path = model_registry.registry_path / f"tfidf_{version}.pkl"
+        with open(model_path, 'wb') as f:
+            pickle.dump(vectorizer, f)
+        
+        model_registry.register_model(
+            'tfidf', str(model_path), version,
+            metadata={'documents': len(corpus), 'vocabulary_size': len(vectorizer.vocabulary_)}
+        )
+        model_registry.set_active_version('tfidf', version)
+        self.tfidf_vectorizer = vectorizer
+        return version
+    
     def _load_bert_model(self) -> None:
         """Lazy load BERT model"""
         if self._bert_loaded:
             return
         
         try:
-            model_name = "all-MiniLM-L6-v2"  # Lightweight and fast
-            self.bert_model = SentenceTransformer(model_name)
+            if settings.BERT_ONNX_ENABLED and not self.use_gpu:
+                if ONNX_AVAILABLE:
+                    try:
+                        self.bert_model = OnnxSentenceEncoder.load(settings.BERT_ONNX_MODEL_PATH)
+                        logger.info("BERT model loaded on CPU (ONNX Runtime, int8)")
+                        self._bert_loaded = True
+                        return
+                    except Exception as e:
+                        logger.error(f"Error loading ONNX BERT model, using PyTorch: {str(e)}")
+                else:
+                    logger.warning("BERT_ONNX_ENABLED is set but optimum[onnxruntime] is not installed; using PyTorch")
+            
+            self.bert_model = SentenceTransformer(BERT_MODEL_NAME)
             
             if self.use_gpu:
-                self.bert_model = self.bert_model.to('cuda')
-                logger.info("BERT model loaded on GPU")
+                # FP16 weights run on tensor cores; MiniLM's cosine rankings are unaffected
+                self.bert_model = self.bert_model.to('cuda').half()
+                logger.info("BERT model loaded on GPU (fp16)")
             else:
                 logger.info("BERT model loaded on CPU")
             
@@ -59,26 +224,39 @@ class EmbeddingGenerator:
             logger.error(f"Error loading BERT model: {str(e)}")
             self.bert_model = None
     
-    def generate_tfidf_embedding(self, text: str, fit: bool = False) -> Optional[np.ndarray]:
+    def warm_up(self) -> None:
+        """
+        Load the BERT model and run one throwaway encode, so the first real request doesn't
+        pay for model loading, CUDA context creation or kernel selection
+        """
+        self._load_bert_model()
+        if not self.bert_model:
+            return
+        
+        try:
+            with torch.inference_mode():
+                self.bert_model.encode(["warmup"], convert_to_numpy=True, show_progress_bar=False)
+            logger.info("BERT model warmed up")
+        except Exception as e:
+            logger.warning(f"BERT warm-up encode failed: {str(e)}")
+    
+    def generate_tfidf_embedding(self, text: str) -> Optional[sparse.csr_matrix]:
         """
         Generate TF-IDF embedding for text
         
         Args:
             text: Input text
-            fit: Whether to fit the vectorizer (for first use)
             
         Returns:
-            TF-IDF embedding vector
+            TF-IDF embedding as a sparse 1 x vocabulary CSR row (float32),
+            or None until a vectorizer has been fitted with fit_tfidf
         """
-        if not self.tfidf_vectorizer:
+        if not self._tfidf_fitted():
             return None
         
         try:
-            if fit:
-                self.tfidf_vectorizer.fit([text])
-            
-            embedding = self.tfidf_vectorizer.transform([text])
-            return embedding.toarray()[0]
+            # Kept sparse: a dense row would be vocabulary-wide for a few hundred non-zeros
+            return self.tfidf_vectorizer.transform([text])
         except Exception as e:
             logger.error(f"Error generating TF-IDF embedding: {str(e)}")
             return None
@@ -99,12 +277,14 @@ class EmbeddingGenerator:
             return None
         
         try:
-            embedding = self.bert_model.encode(
-                text,
-                convert_to_numpy=True,
-                show_progress_bar=False
-            )
-            return embedding
+            with torch.inference_mode():
+                embedding = self.bert_model.encode(
+                    text,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+            # Contiguous float32, as the similarity kernels expect
+            return np.ascontiguousarray(embedding, dtype=np.float32)
         except Exception as e:
             logger.error(f"Error generating BERT embedding: {str(e)}")
             return None
@@ -112,17 +292,22 @@ class EmbeddingGenerator:
     def generate_embeddings_batch(
         self,
         texts: List[str],
-        method: str = "bert"
-    ) -> List[Optional[np.ndarray]]:
+        method: str = "bert",
+        batch_size: Optional[int] = None,
+        show_progress_bar: bool = True
+    ) -> Union[List[Optional[np.ndarray]], sparse.csr_matrix]:
         """
         Generate embeddings for multiple texts (batch processing)
         
         Args:
             texts: List of input texts
             method: 'bert' or 'tfidf'
+            batch_size: Texts per BERT forward pass (default: 128 on GPU, 32 on CPU)
+            show_progress_bar: Show the sentence-transformers progress bar
             
         Returns:
-            List of embedding vectors
+            List of embedding vectors for 'bert'; for 'tfidf', a sparse
+            len(texts) x vocabulary CSR matrix (one row per text)
         """
         if method == "bert":
             self._load_bert_model()
@@ -130,28 +315,32 @@ class EmbeddingGenerator:
                 return [None] * len(texts)
             
             try:
-                embeddings = self.bert_model.encode(
-                    texts,
-                    convert_to_numpy=True,
-                    show_progress_bar=True,
-                    batch_size=32
-                )
+                # encode() already length-sorts its input to minimise padding, but it tokenizes each
+                # full resume before truncating to max_seq_length. Trim first so tokenizing is bounded
+                # and the length sort ranks texts by what the model will actually read.
+                max_chars = self.bert_model.max_seq_length * CHARS_PER_TOKEN_BOUND
+                texts = [text[:max_chars] for text in texts]
+                if batch_size is None:
+                    batch_size = GPU_BATCH_SIZE if self.use_gpu else CPU_BATCH_SIZE
+                with torch.inference_mode():
+                    embeddings = self.bert_model.encode(
+                        texts,
+                        convert_to_numpy=True,
+                        show_progress_bar=show_progress_bar,
+                        batch_size=batch_size
+                    )
                 return [emb for emb in embeddings]
             except Exception as e:
                 logger.error(f"Error generating batch BERT embeddings: {str(e)}")
                 return [None] * len(texts)
         
         elif method == "tfidf":
-            if not self.tfidf_vectorizer:
+            # The vectorizer is fitted offline (fit_tfidf) and never refitted here
+            if not self._tfidf_fitted():
                 return [None] * len(texts)
             
             try:
-                # Fit on all texts if not already fitted
-                if not hasattr(self.tfidf_vectorizer, 'vocabulary_'):
-                    self.tfidf_vectorizer.fit(texts)
-                
-                embeddings = self.tfidf_vectorizer.transform(texts)
-                return [emb.toarray()[0] for emb in embeddings]
+                return self.tfidf_vectorizer.transform(texts)
             except Exception as e:
                 logger.error(f"Error generating batch TF-IDF embeddings: {str(e)}")
                 return [None] * len(texts)
@@ -169,29 +358,41 @@ class EmbeddingGenerator:
         Calculate similarity between two embeddings
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First embedding vector (dense, or a sparse TF-IDF row)
+            embedding2: Second embedding vector (dense, or a sparse TF-IDF row)
             method: 'cosine' or 'euclidean'
             
         Returns:
             Similarity score (0-1 for cosine, distance for euclidean)
         """
         try:
+            if sparse.issparse(embedding1) and sparse.issparse(embedding2):
+                return self._sparse_similarity(embedding1, embedding2, method)
+            
+            # One contiguous float32 copy at most, so the dot products take the BLAS sdot path
+            embedding1 = np.ascontiguousarray(embedding1, dtype=np.float32)
+            embedding2 = np.ascontiguousarray(embedding2, dtype=np.float32)
+            
             if method == "cosine":
-                # Cosine similarity
-                dot_product = np.dot(embedding1, embedding2)
-                norm1 = np.linalg.norm(embedding1)
-                norm2 = np.linalg.norm(embedding2)
+                if SIMSIMD_AVAILABLE:
+                    # simsimd.cosine is a distance (1 - similarity); zero vectors score 0 like below
+                    if not embedding1.any() or not embedding2.any():
+                        return 0.0
+                    return 1.0 - float(simsimd.cosine(embedding1, embedding2))
                 
-                if norm1 == 0 or norm2 == 0:
+                # Cosine similarity: three dot products and a single sqrt
+                denom_sq = float(np.vdot(embedding1, embedding1)) * float(np.vdot(embedding2, embedding2))
+                if denom_sq == 0:
                     return 0.0
                 
-                similarity = dot_product / (norm1 * norm2)
-                return float(similarity)
+                return float(np.dot(embedding1, embedding2) / math.sqrt(denom_sq))
             
             elif method == "euclidean":
                 # Euclidean distance (convert to similarity)
-                distance = np.linalg.norm(embedding1 - embedding2)
+                if SIMSIMD_AVAILABLE:
+                    distance = math.sqrt(float(simsimd.sqeuclidean(embedding1, embedding2)))
+                else:
+                    distance = np.linalg.norm(embedding1 - embedding2)
                 # Normalize to 0-1 range (assuming max distance of 2 for normalized vectors)
                 similarity = 1.0 / (1.0 + distance)
                 return float(similarity)
@@ -202,6 +403,25 @@ class EmbeddingGenerator:
         except Exception as e:
             logger.error(f"Error calculating similarity: {str(e)}")
             return 0.0
+    
+    @staticmethod
+    def _sparse_similarity(embedding1, embedding2, method: str) -> float:
+        """calculate_similarity for two sparse 1 x N rows, without densifying them"""
+        if method == "cosine":
+            norm_sq1 = embedding1.multiply(embedding1).sum()
+            norm_sq2 = embedding2.multiply(embedding2).sum()
+            if norm_sq1 == 0 or norm_sq2 == 0:
+                return 0.0
+            dot_product = embedding1.multiply(embedding2).sum()
+            return float(dot_product / math.sqrt(norm_sq1 * norm_sq2))
+        
+        elif method == "euclidean":
+            diff = embedding1 - embedding2
+            distance = math.sqrt(diff.multiply(diff).sum())
+            return float(1.0 / (1.0 + distance))
+        
+        else:
+            raise ValueError(f"Unknown similarity method: {method}")
 
 
 # Singleton instance
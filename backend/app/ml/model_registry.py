@@ -20,6 +20,8 @@ class ModelRegistry:
         self.registry_path.mkdir(parents=True, exist_ok=True)
         self.registry_file = self.registry_path / "registry.json"
         self.models: Dict[str, Dict[str, Any]] = {}
+        # Unpickled models, keyed by (model_name, version); versions are immutable once registered
+        self._loaded: Dict[tuple, Any] = {}
         self.load_registry()
     
     def load_registry(self) -> None:
@@ -112,6 +114,23 @@ class ModelRegistry:
         
         return self.models[model_name][version]['path']
     
+    def load_pickle(self, model_name: str, version: Optional[str] = None) -> Optional[Any]:
+        """Unpickle a registered model (active version by default), once per version"""
+        if version is None:
+            version = self.get_active_version(model_name)
+            if version is None:
+                return None
+        
+        key = (model_name, version)
+        if key not in self._loaded:
+            model_path = self.get_model_path(model_name, version)
+            if model_path is None:
+                return None
+            with open(model_path, 'rb') as f:
+                self._loaded[key] = pickle.load(f)
+            logger.info(f"Loaded model {model_name} version {version} from {model_path}")
+        return self._loaded[key]
+    
     def list_models(self) -> Dict[str, Any]:
         """List all registered models"""
         return {
@@ -2,7 +2,7 @@
 Interview Model
 Stores interview scheduling and attendance information
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, func, Enum, Integer, Text, Boolean, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, func, Enum, Integer, Text, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -37,17 +37,17 @@ class Interview(Base):
     __tablename__ = "interviews"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False, index=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)  # covered by ix_interview_job_cand_date
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False, index=True)
     
     # Interview scheduling details
-    interview_date = Column(DateTime(timezone=True), nullable=False, index=True)
+    interview_date = Column(DateTime(timezone=True), nullable=False)  # covered by ix_interviews_date_desc_id
     interview_time = Column(String(10), nullable=False)  # HH:MM format
     interview_timezone = Column(String(50), nullable=False, default="UTC")
     interview_duration = Column(Integer, nullable=False, default=60)  # Duration in minutes
     interviewer_name = Column(String(255), nullable=True)
-    interview_type = Column(Enum(InterviewType), default=InterviewType.OFFLINE, nullable=False)
-    interview_status = Column(Enum(InterviewStatus), default=InterviewStatus.SCHEDULED, nullable=False, index=True)
+    interview_type = Column(Enum(InterviewType, values_callable=lambda e: [m.value for m in e]), default=InterviewType.OFFLINE, nullable=False)
+    interview_status = Column(Enum(InterviewStatus, values_callable=lambda e: [m.value for m in e]), default=InterviewStatus.SCHEDULED, nullable=False, index=True)
     
     # Online interview fields
     online_interview_enabled = Column(Boolean, default=False, nullable=False)
@@ -75,8 +75,10 @@ class Interview(Base):
     
     # Indexes for common queries
     __table_args__ = (
-        Index('ix_interview_job_candidate', 'job_id', 'candidate_id'),
+        Index('ix_interview_job_cand_date', 'job_id', 'candidate_id', 'interview_date'),
         Index('ix_interview_date_status', 'interview_date', 'interview_status'),
+        # Matches list_interviews' ORDER BY interview_date DESC, id DESC (keyset pagination)
+        Index('ix_interviews_date_desc_id', text('interview_date DESC'), text('id DESC')),
     )
     
     def __repr__(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func, Enum
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -20,7 +20,7 @@ class Job(Base):
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=False)
     requirements_json = Column(JSONB, nullable=True)  # Skills, experience, education, etc.
-    status = Column(Enum(JobStatus), default=JobStatus.DRAFT, nullable=False, index=True)
+    status = Column(Enum(JobStatus, values_callable=lambda e: [m.value for m in e]), default=JobStatus.DRAFT, nullable=False, index=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -30,6 +30,16 @@ class Job(Base):
     processing_queues = relationship("ProcessingQueue", back_populates="job", cascade="all, delete-orphan")
     match_results = relationship("MatchResult", back_populates="job", cascade="all, delete-orphan")
 
+    # GIN index for requirements_json containment (@>) filters
+    __table_args__ = (
+        Index(
+            'ix_jobs_requirements_gin',
+            'requirements_json',
+            postgresql_using='gin',
+            postgresql_ops={'requirements_json': 'jsonb_path_ops'},
+        ),
+    )
+
     def __repr__(self):
         return f"<Job(id={self.id}, title={self.title}, status={self.status})>"
 
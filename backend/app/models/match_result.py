@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, func, Numeric, Index, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, func, REAL, Index, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -9,28 +9,37 @@ class MatchResult(Base):
     __tablename__ = "match_results"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False, index=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False, index=True)
     scores_json = Column(JSONB, nullable=False)  # Overall score, skill match, experience match, etc.
-    rank = Column(String(10), nullable=True, index=True)  # Ranking position
+    rank = Column(Integer, nullable=True, index=True)  # Ranking position
     explanation = Column(JSONB, nullable=True)  # AI-generated explanation of match
-    overall_score = Column(Numeric(5, 2), nullable=False, index=True)  # 0.00 to 100.00
+    overall_score = Column(REAL, nullable=False, index=True)  # 0.00 to 100.00 (float4)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Interview-related fields (additive, backward-compatible)
     interview_enabled = Column(Boolean, default=False, nullable=False)  # Toggle to enable interview scheduling
     online_interview_enabled = Column(Boolean, default=False, nullable=False)  # Toggle for online interview
-    shortlisted = Column(Boolean, default=False, nullable=False, index=True)  # Whether candidate is shortlisted
+    shortlisted = Column(Boolean, default=False, nullable=False)  # Whether candidate is shortlisted
 
-    # Relationships
-    job = relationship("Job", back_populates="match_results")
-    candidate = relationship("Candidate", back_populates="match_results")
+    # Relationships (lazy="raise": load them explicitly with joinedload/selectinload)
+    job = relationship("Job", back_populates="match_results", lazy="raise")
+    candidate = relationship("Candidate", back_populates="match_results", lazy="raise")
 
-    # Composite indexes for efficient queries
+    # Composite indexes for efficient queries (also cover job_id alone)
     __table_args__ = (
-        Index('ix_match_results_job_score', 'job_id', 'overall_score'),
+        # Matches the ranked endpoint's ORDER BY overall_score DESC, rank so top-K is an index scan
+        Index('ix_match_results_job_score_desc', 'job_id', text('overall_score DESC'), 'rank'),
         Index('ix_match_results_job_rank', 'job_id', 'rank'),
+        Index('uq_match_results_job_candidate', 'job_id', 'candidate_id', unique=True),
+        # Partial index over the shortlisted minority, ordered by score within a job
+        Index(
+            'ix_match_results_shortlisted',
+            'job_id',
+            text('overall_score DESC'),
+            postgresql_where=text('shortlisted'),
+        ),
     )
 
     def __repr__(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func, Enum, Index
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, func, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -18,12 +18,17 @@ class ProcessingQueue(Base):
     __tablename__ = "processing_queue"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False, index=True)
-    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), nullable=False, index=True)
-    status = Column(Enum(ProcessingStatus), default=ProcessingStatus.PENDING, nullable=False, index=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), nullable=False)
+    # Stored by value ('pending', ...), matching migration 001's type and the partial index predicate below
+    status = Column(
+        Enum(ProcessingStatus, values_callable=lambda e: [m.value for m in e]),
+        default=ProcessingStatus.PENDING,
+        nullable=False
+    )
     error_message = Column(Text, nullable=True)
-    retry_count = Column(String(10), default="0", nullable=False)
-    progress = Column(String(10), default="0", nullable=False)  # 0-100
+    retry_count = Column(Integer, default=0, server_default="0", nullable=False)
+    progress = Column(Integer, default=0, server_default="0", nullable=False)  # 0-100
     metadata_json = Column(JSONB, nullable=True)  # Additional processing metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -33,10 +38,17 @@ class ProcessingQueue(Base):
     job = relationship("Job", back_populates="processing_queues")
     resume = relationship("Resume", back_populates="processing_queues")
 
-    # Composite index for efficient queries
+    # Composite indexes for efficient queries (also cover job_id / resume_id alone)
     __table_args__ = (
         Index('ix_processing_queue_job_status', 'job_id', 'status'),
         Index('ix_processing_queue_resume_status', 'resume_id', 'status'),
+        # Partial index over the live tail of the queue, ordered for FIFO polling per status
+        Index(
+            'ix_processing_queue_active',
+            'status',
+            'created_at',
+            postgresql_where=text("status IN ('pending', 'retrying', 'processing')"),
+        ),
     )
 
     def __repr__(self):
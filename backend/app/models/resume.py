@@ -1,18 +1,23 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func, Enum, Index
+from sqlalchemy import Column, String, BigInteger, Text, DateTime, ForeignKey, func, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 import enum
+from app.core.config import configure_hnsw_params
 from app.database import Base
 
-# Try to import Vector, fallback to JSONB if pgvector is not available
+# Try to import HALFVEC, fallback to JSONB if pgvector is not available
 try:
-    from pgvector.sqlalchemy import Vector
+    from pgvector.sqlalchemy import HALFVEC
     VECTOR_AVAILABLE = True
 except ImportError:
     VECTOR_AVAILABLE = False
     # Use JSONB as fallback for embedding_vector
-    Vector = JSONB
+    HALFVEC = JSONB
+
+# create_all builds the HNSW index on an empty table, so it takes the small-collection
+# parameters; migration 005 sizes them to the row count instead
+_HNSW_PARAMS = configure_hnsw_params(0)
 
 
 class ResumeStatus(str, enum.Enum):
@@ -30,15 +35,15 @@ class Resume(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     file_path = Column(String(512), nullable=False)  # S3 path or local path
     file_name = Column(String(255), nullable=False)
-    file_size = Column(String(50), nullable=True)  # File size in bytes
+    file_size = Column(BigInteger, nullable=True)  # File size in bytes
     file_type = Column(String(50), nullable=False)  # pdf, doc, docx
     parsed_data_json = Column(JSONB, nullable=True)  # Extracted text, skills, experience, etc.
-    # Use Vector if pgvector is available, otherwise use JSONB
+    # Use halfvec if pgvector is available, otherwise use JSONB
     embedding_vector = Column(
-        Vector(384) if VECTOR_AVAILABLE else JSONB, 
+        HALFVEC(384) if VECTOR_AVAILABLE else JSONB, 
         nullable=True
-    )  # BERT embedding vector (Vector(384) or JSONB)
-    status = Column(Enum(ResumeStatus), default=ResumeStatus.UPLOADED, nullable=False, index=True)
+    )  # BERT embedding vector (halfvec(384) or JSONB)
+    status = Column(Enum(ResumeStatus, values_callable=lambda e: [m.value for m in e]), default=ResumeStatus.UPLOADED, nullable=False, index=True)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -48,10 +53,24 @@ class Resume(Base):
     candidates = relationship("Candidate", back_populates="resume", cascade="all, delete-orphan")
     processing_queues = relationship("ProcessingQueue", back_populates="resume", cascade="all, delete-orphan")
 
-    # Index for vector similarity search (only if pgvector is available)
+    # GIN index for parsed_data_json containment (@>) filters, plus the vector similarity
+    # search index (only if pgvector is available)
     __table_args__ = (
-        Index('ix_resume_embedding', 'embedding_vector', postgresql_using='ivfflat') if VECTOR_AVAILABLE else (),
-    ) if VECTOR_AVAILABLE else ()
+        Index(
+            'ix_resumes_parsed_data_gin',
+            'parsed_data_json',
+            postgresql_using='gin',
+            postgresql_ops={'parsed_data_json': 'jsonb_path_ops'},
+        ),
+    ) + ((
+        Index(
+            'ix_resume_embedding',
+            'embedding_vector',
+            postgresql_using='hnsw',
+            postgresql_with={'m': _HNSW_PARAMS['m'], 'ef_construction': _HNSW_PARAMS['ef_construction']},
+            postgresql_ops={'embedding_vector': 'halfvec_cosine_ops'},
+        ),
+    ) if VECTOR_AVAILABLE else ())
 
     def __repr__(self):
         return f"<Resume(id={self.id}, file_name={self.file_name}, status={self.status})>"
@@ -13,6 +13,7 @@ from app.schemas.job import (
     JobCreate,
     JobUpdate,
     JobListResponse,
+    MatchCandidatesResponse,
 )
 from app.schemas.resume import (
     Resume,
@@ -24,6 +25,7 @@ from app.schemas.resume import (
 from app.schemas.candidate import (
     Candidate,
     CandidateCreate,
+    BulkShortlistRequest,
 )
 from app.schemas.processing_queue import (
     ProcessingQueue,
@@ -51,6 +53,7 @@ __all__ = [
     "JobCreate",
     "JobUpdate",
     "JobListResponse",
+    "MatchCandidatesResponse",
     "Resume",
     "ResumeCreate",
     "ResumeUpdate",
@@ -58,6 +61,7 @@ __all__ = [
     "ResumeUploadResponse",
     "Candidate",
     "CandidateCreate",
+    "BulkShortlistRequest",
     "ProcessingQueue",
     "ProcessingQueueCreate",
     "ProcessingQueueUpdate",
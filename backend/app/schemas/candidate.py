@@ -1,7 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class CandidateBase(BaseModel):
@@ -26,3 +26,12 @@ class CandidateInDB(CandidateBase):
 class Candidate(CandidateInDB):
     pass
 
+
+class BulkShortlistItem(BaseModel):
+    candidate_id: UUID
+    shortlisted: bool = True
+
+
+class BulkShortlistRequest(BaseModel):
+    job_id: UUID
+    items: List[BulkShortlistItem] = Field(..., min_length=1, max_length=500)
@@ -77,9 +77,10 @@ class Interview(InterviewInDB):
 class InterviewListResponse(BaseModel):
     """Response for listing interviews"""
     items: list[Interview]
-    total: int
+    total: Optional[int] = None  # Not computed for cursor-paginated requests
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class InterviewJoinRequest(BaseModel):
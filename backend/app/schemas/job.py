@@ -42,3 +42,28 @@ class JobListResponse(BaseModel):
     page: int
     page_size: int
 
+
+
+class CandidateMatchResult(BaseModel):
+    """Individual candidate match result"""
+    candidate_id: str
+    anonymized_id: str
+    resume_id: str
+    resume_file_name: str
+    candidate_name: str
+    final_score: float
+    rank: int
+    component_scores: Dict[str, float]
+    matched_skills: List[str]
+    missing_skills: List[str]
+    experience_summary: str
+
+
+class MatchCandidatesResponse(BaseModel):
+    """Response for match candidates endpoint"""
+    job_id: str
+    job_title: str
+    candidates_matched: int
+    ranked_candidates: List[CandidateMatchResult]
+    matching_weights: Dict[str, float]
+    message: Optional[str] = None
@@ -1,18 +1,27 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from decimal import Decimal
+
+
+def result_cache_key(result_id) -> str:
+    """Redis key of the serialized GET /results/{id} response"""
+    return f"match_result:{result_id}"
 
 
 class MatchResultBase(BaseModel):
     job_id: UUID
     candidate_id: UUID
     scores_json: Dict[str, Any]
-    overall_score: Decimal = Field(..., ge=0, le=100)
-    rank: Optional[str] = None
+    overall_score: float = Field(..., ge=0, le=100)
+    rank: Optional[int] = None
     explanation: Optional[Dict[str, Any]] = None
 
+    @field_serializer('overall_score')
+    def _round_overall_score(self, value: float) -> float:
+        # Stored as float4; present the two decimals the column used to hold
+        return round(value, 2)
+
 
 class MatchResultCreate(MatchResultBase):
     pass
@@ -20,8 +29,8 @@ class MatchResultCreate(MatchResultBase):
 
 class MatchResultUpdate(BaseModel):
     scores_json: Optional[Dict[str, Any]] = None
-    overall_score: Optional[Decimal] = Field(None, ge=0, le=100)
-    rank: Optional[str] = None
+    overall_score: Optional[float] = Field(None, ge=0, le=100)
+    rank: Optional[int] = None
     explanation: Optional[Dict[str, Any]] = None
 
 
@@ -46,8 +55,8 @@ class MatchResultListResponse(BaseModel):
 
 class MatchResultFilter(BaseModel):
     job_id: Optional[UUID] = None
-    min_score: Optional[Decimal] = Field(None, ge=0, le=100)
-    max_score: Optional[Decimal] = Field(None, ge=0, le=100)
+    min_score: Optional[float] = Field(None, ge=0, le=100)
+    max_score: Optional[float] = Field(None, ge=0, le=100)
     limit: Optional[int] = Field(10, ge=1, le=100)
     offset: Optional[int] = Field(0, ge=0)
 
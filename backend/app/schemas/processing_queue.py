@@ -17,8 +17,8 @@ class ProcessingQueueCreate(ProcessingQueueBase):
 class ProcessingQueueUpdate(BaseModel):
     status: Optional[ProcessingStatus] = None
     error_message: Optional[str] = None
-    retry_count: Optional[str] = None
-    progress: Optional[str] = None
+    retry_count: Optional[int] = None
+    progress: Optional[int] = Field(None, ge=0, le=100)
     metadata_json: Optional[Dict[str, Any]] = None
 
 
@@ -26,8 +26,8 @@ class ProcessingQueueInDB(ProcessingQueueBase):
     id: UUID
     status: ProcessingStatus
     error_message: Optional[str] = None
-    retry_count: str
-    progress: str
+    retry_count: int
+    progress: int
     metadata_json: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
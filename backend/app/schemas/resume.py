@@ -12,7 +12,7 @@ class ResumeBase(BaseModel):
 
 class ResumeCreate(ResumeBase):
     file_path: str
-    file_size: Optional[str] = None
+    file_size: Optional[int] = None
 
 
 class ResumeUpdate(BaseModel):
@@ -24,7 +24,7 @@ class ResumeUpdate(BaseModel):
 class ResumeInDB(ResumeBase):
     id: UUID
     file_path: str
-    file_size: Optional[str] = None
+    file_size: Optional[int] = None
     parsed_data_json: Optional[Dict[str, Any]] = None
     status: ResumeStatus
     uploaded_by: UUID
@@ -43,6 +43,18 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class AuthenticatedUser(BaseModel):
+    """The users columns request handlers need; immutable so one instance can be shared across requests"""
+    id: UUID
+    email: str
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(frozen=True)
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     user_id: Optional[UUID] = None
@@ -5,6 +5,7 @@ Implements weighted matching with skills (50%), experience (30%), and semantic s
 import logging
 import numpy as np
 import re
+import torch
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from app.database import SessionLocal
@@ -17,15 +18,25 @@ from app.services.skill_extractor import skill_extractor
 from app.services.experience_parser import experience_parser
 from app.services.resume_parser import resume_parser
 from app.services.file_service import file_service
-from app.ml.embeddings import EmbeddingGenerator
-from sqlalchemy.orm import Session
+from app.ml.embeddings import embedding_generator
+from sqlalchemy.orm import Session, selectinload
 
-# Initialize embedding generator
-embedding_generator = EmbeddingGenerator()
+# Resume texts per BERT forward pass when scoring semantic similarity
+EMBEDDING_BATCH_SIZE = 256
 
 logger = logging.getLogger(__name__)
 
 
+def competition_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    Competition ("1224") ranks, highest score first: rank = 1 + number of strictly
+    higher scores, so tied scores share a rank and the next rank is skipped.
+    Counted with searchsorted over the sorted scores rather than an (n x n)
+    comparison matrix, which would not fit in memory for large resume pools.
+    """
+    return 1 + len(scores) - np.searchsorted(np.sort(scores), scores, side='right')
+
+
 class CandidateMatcher:
     """Match candidates to jobs using weighted scoring"""
     
@@ -112,7 +123,8 @@ class CandidateMatcher:
             
             # Get all resumes (including those not fully processed)
             # Create candidates on-the-fly if they don't exist
-            all_resumes = db.query(Resume).all()
+            # Candidates are loaded with one extra SELECT ... IN instead of one query per resume
+            all_resumes = db.query(Resume).options(selectinload(Resume.candidates)).all()
             
             logger.info(f"Found {len(all_resumes)} resumes")
             
@@ -126,25 +138,43 @@ class CandidateMatcher:
                     'message': 'No resumes found. Please upload resumes first.'
                 }
             
-            # Match each resume
+            # Get or create the candidate for each resume; missing ones are committed together
+            candidates_by_resume = {}
+            new_candidates = []
+            for resume in all_resumes:
+                if resume.candidates:
+                    candidates_by_resume[resume.id] = resume.candidates[0]
+                    continue
+                candidate = Candidate(
+                    id=uuid.uuid4(),
+                    anonymized_id=f"CAND-{uuid.uuid4().hex[:8].upper()}",
+                    resume_id=resume.id,
+                    masked_data_json={}
+                )
+                new_candidates.append(candidate)
+                candidates_by_resume[resume.id] = candidate
+            
+            if new_candidates:
+                db.add_all(new_candidates)
+                db.commit()
+                logger.info(f"Created {len(new_candidates)} candidates for resumes without one")
+                # The commit expired every loaded row; reload them in bulk rather than per attribute access
+                all_resumes = db.query(Resume).options(selectinload(Resume.candidates)).all()
+            
+            # Match each resume; per-candidate component scores are gathered into arrays
             match_results = []
+            skill_scores: List[float] = []
+            experience_scores: List[float] = []
+            semantic_scores: List[float] = []
+            embedding_rows: List[int] = []
+            resume_embeddings: List[np.ndarray] = []
+            embed_rows: List[int] = []
+            texts_to_embed: List[str] = []
             
             for resume in all_resumes:
-                # Get or create candidate for this resume
-                candidate = db.query(Candidate).filter(Candidate.resume_id == resume.id).first()
-                if not candidate:
-                    # Create candidate on-the-fly
-                    import uuid
-                    anonymized_id = f"CAND-{uuid.uuid4().hex[:8].upper()}"
-                    candidate = Candidate(
-                        anonymized_id=anonymized_id,
-                        resume_id=resume.id,
-                        masked_data_json={}
-                    )
-                    db.add(candidate)
-                    db.commit()
-                    db.refresh(candidate)
-                    logger.info(f"Created candidate {candidate.id} for resume {resume.id}")
+                candidate = candidates_by_resume.get(resume.id)
+                if candidate is None:
+                    continue  # Uploaded after the candidate pass above
                 
                 # ALWAYS get resume_text from multiple sources (parsed_data_json OR file_path)
                 resume_data = resume.parsed_data_json or {}
@@ -189,7 +219,12 @@ class CandidateMatcher:
                 skills_data = {}
                 extracted_skills = []
                 
-                if resume_text and len(resume_text) > 50:
+                # Reuse the skills process_resume already extracted and persisted
+                persisted_skills = resume_data.get('skills')
+                if isinstance(persisted_skills, dict) and persisted_skills.get('skills'):
+                    skills_data = persisted_skills
+                    extracted_skills = list(persisted_skills['skills'])
+                elif resume_text and len(resume_text) > 50:
                     try:
                         # Method 1: Use skill_extractor (spaCy-based)
                         skills_data = skill_extractor.extract_skills(resume_text)
@@ -249,7 +284,12 @@ class CandidateMatcher:
                 experience_data = {}
                 total_experience_years = 0.0
                 
-                if resume_text and len(resume_text) > 50:
+                # Reuse the experience process_resume already parsed and persisted
+                persisted_experience = resume_data.get('experience')
+                if isinstance(persisted_experience, dict) and (persisted_experience.get('total_experience_years') or 0) > 0:
+                    experience_data = dict(persisted_experience)
+                    total_experience_years = float(persisted_experience['total_experience_years'])
+                elif resume_text and len(resume_text) > 50:
                     try:
                         # Method 1: Use experience_parser
                         experience_data = experience_parser.extract_experience(resume_text)
@@ -360,56 +400,81 @@ class CandidateMatcher:
                 )
                 logger.info(f"📊 Resume {resume.id} EXPERIENCE SCORE: {experience_score:.2%} (Resume: {experience_details.get('resume_years', 0):.1f} years, Required: {experience_details.get('required_years', 0):.1f} years)")
                 
-                # Calculate semantic similarity score (20%) - always from resume_text
-                semantic_score = self._calculate_semantic_similarity(
+                # Semantic similarity (20%) is scored for all candidates at once after the loop
+                resume_embedding, embed_text, semantic_fallback = self._semantic_inputs(
                     resume, job_embedding, resume_text
                 )
-                # Ensure semantic_score has a safe fallback (default to 0.4 for related content)
-                if semantic_score is None:
-                    semantic_score = 0.4  # Minimum for related content
-                elif semantic_score < 0.4:
-                    semantic_score = 0.4  # Minimum baseline for HR-related resumes
-                logger.info(f"📊 Resume {resume.id} SEMANTIC SCORE: {semantic_score:.2%}")
-                
-                # Calculate final weighted score (Skills: 50%, Experience: 30%, Semantic: 20%)
-                final_score = (
-                    skill_score * self.weights['skills'] +
-                    experience_score * self.weights['experience'] +
-                    semantic_score * self.weights['semantic']
-                ) * 100  # Convert to percentage
-                
-                # Ensure score is between 0-100
-                final_score = max(0.0, min(100.0, final_score))
-                
-                logger.info(f"🎯 Resume {resume.id} FINAL SCORE: {final_score:.2f}% (Skills: {skill_score*100:.1f}% × 50% = {skill_score*self.weights['skills']*100:.1f}%, Experience: {experience_score*100:.1f}% × 30% = {experience_score*self.weights['experience']*100:.1f}%, Semantic: {semantic_score*100:.1f}% × 20% = {semantic_score*self.weights['semantic']*100:.1f}%)")
                 
-                # Extract matched and missing skills
-                matched_skills = skill_details.get('matched_skills', [])
-                missing_skills = skill_details.get('missing_skills', [])
+                skill_scores.append(skill_score)
+                experience_scores.append(experience_score)
+                semantic_scores.append(semantic_fallback)
+                if embed_text is not None:
+                    embed_rows.append(len(match_results))
+                    texts_to_embed.append(embed_text)
+                elif resume_embedding is not None:
+                    embedding_rows.append(len(match_results))
+                    resume_embeddings.append(resume_embedding)
                 
                 match_results.append({
                     'candidate_id': str(candidate.id),
                     'anonymized_id': candidate.anonymized_id,
                     'resume_id': str(resume.id),
                     'resume_file_name': resume.file_name,
-                    'final_score': round(final_score, 2),
-                    'component_scores': {
-                        'skills': round(skill_score * 100, 2),
-                        'experience': round(experience_score * 100, 2),
-                        'semantic_similarity': round(float(semantic_score or 0.0) * 100, 2)
-                    },
-                    'matched_skills': matched_skills,
-                    'missing_skills': missing_skills,
+                    'matched_skills': skill_details.get('matched_skills', []),
+                    'missing_skills': skill_details.get('missing_skills', []),
                     'experience_summary': experience_details.get('summary', ''),
                     'candidate_name': self._extract_candidate_name(resume_data)
                 })
             
-            # Sort by final score (descending)
-            match_results.sort(key=lambda x: x['final_score'], reverse=True)
+            # Encode every resume text in one batched model call instead of one call per resume
+            if texts_to_embed:
+                batch_embeddings = embedding_generator.generate_embeddings_batch(
+                    texts_to_embed, batch_size=EMBEDDING_BATCH_SIZE, show_progress_bar=False
+                )
+                for row, text, embedding in zip(embed_rows, texts_to_embed, batch_embeddings):
+                    if embedding is None:
+                        logger.warning("Failed to generate embedding from resume text, using fallback")
+                        semantic_scores[row] = self._fallback_semantic_score(text, {})
+                    else:
+                        embedding_rows.append(row)
+                        resume_embeddings.append(np.asarray(embedding, dtype=np.float32))
             
-            # Add rank
-            for idx, result in enumerate(match_results, start=1):
-                result['rank'] = idx
+            if match_results:
+                semantic = np.asarray(semantic_scores, dtype=np.float64)
+                if resume_embeddings:
+                    semantic[embedding_rows] = self._semantic_scores(np.stack(resume_embeddings), job_embedding)
+                # Minimum baseline for related content (HR resumes for HR jobs should never be 0)
+                semantic = np.maximum(semantic, 0.4)
+                
+                # (n x 3) component matrix times the weight vector gives every final score in one BLAS call
+                components = np.column_stack([
+                    np.asarray(skill_scores, dtype=np.float64),
+                    np.asarray(experience_scores, dtype=np.float64),
+                    semantic
+                ])
+                weights = np.array(
+                    [self.weights['skills'], self.weights['experience'], self.weights['semantic']],
+                    dtype=np.float64
+                )
+                final_scores = np.round(np.clip(components @ weights * 100, 0.0, 100.0), 2)
+                component_pct = np.round(components * 100, 2)
+                
+                for i, result in enumerate(match_results):
+                    result['final_score'] = float(final_scores[i])
+                    result['component_scores'] = {
+                        'skills': float(component_pct[i, 0]),
+                        'experience': float(component_pct[i, 1]),
+                        'semantic_similarity': float(component_pct[i, 2])
+                    }
+                
+                # Tied (rounded) scores share a rank
+                ranks = competition_ranks(final_scores)
+                for i, result in enumerate(match_results):
+                    result['rank'] = int(ranks[i])
+                
+                # Stable descending order, matching list.sort(reverse=True) on ties
+                order = np.argsort(-final_scores, kind='stable')
+                match_results = [match_results[i] for i in order]
             
             logger.info(f"Matched {len(match_results)} candidates to job {job_id}")
             
@@ -1241,82 +1306,75 @@ class CandidateMatcher:
         
         return round(max_years, 1)
     
-    def _calculate_semantic_similarity(
+    def _semantic_inputs(
         self,
         resume: Resume,
         job_embedding: Optional[np.ndarray],
         raw_text: str = ''
-    ) -> float:
-        """Calculate semantic similarity using embeddings (0-1) - always from raw_text"""
+    ) -> Tuple[Optional[np.ndarray], Optional[str], float]:
+        """
+        Decide how a resume gets its semantic embedding: the one persisted by
+        process_resume when present, otherwise encoded from raw_text
+        
+        Returns:
+            (stored embedding, text to encode, fallback score); the fallback applies when
+            neither an embedding nor a text is returned, or when encoding the text fails
+        """
         try:
             if job_embedding is None:
                 logger.warning("Job embedding is None, using fallback semantic score")
-                return 0.3  # Fallback score instead of 0
-            
-            # Get raw_text if not provided
-            if not raw_text or len(raw_text.strip()) < 10:
-                resume_data = resume.parsed_data_json or {}
-                raw_text = resume_data.get('raw_text', '') or resume.file_name or ''
+                return None, None, 0.3  # Fallback score instead of 0
             
-            # Get resume embedding
-            resume_embedding = None
-            if resume.embedding_vector:
+            if resume.embedding_vector is not None:
                 try:
-                    # Handle both Vector type and JSONB (list)
+                    # Handle both halfvec (HalfVector) and JSONB (list); halfvec rows stay fp16 until
+                    # the stacked matrix is upcast once in _semantic_scores
                     if isinstance(resume.embedding_vector, list):
                         resume_embedding = np.array(resume.embedding_vector, dtype=np.float32)
                     else:
-                        resume_embedding = np.array(resume.embedding_vector, dtype=np.float32)
+                        resume_embedding = resume.embedding_vector.to_numpy()
                     
                     # Validate embedding shape
-                    if resume_embedding.shape[0] != job_embedding.shape[0]:
-                        logger.warning(f"Embedding dimension mismatch: resume={resume_embedding.shape[0]}, job={job_embedding.shape[0]}")
-                        resume_embedding = None
+                    if resume_embedding.shape[0] == job_embedding.shape[0]:
+                        return resume_embedding, None, 0.3
+                    logger.warning(f"Embedding dimension mismatch: resume={resume_embedding.shape[0]}, job={job_embedding.shape[0]}")
                 except Exception as e:
                     logger.warning(f"Error converting resume embedding: {str(e)}")
-                    resume_embedding = None
             
-            # ALWAYS generate embedding from raw_text at match time (don't rely on stored embedding)
-            if resume_embedding is None or raw_text:
-                if raw_text and len(raw_text.strip()) >= 10:
-                    try:
-                        logger.debug(f"Generating embedding from raw_text (length={len(raw_text)})")
-                        resume_embedding = embedding_generator.generate_bert_embedding(raw_text)
-                        if resume_embedding is None:
-                            logger.warning("Failed to generate embedding from resume text, using fallback")
-                            return self._fallback_semantic_score(raw_text, {})
-                    except Exception as e:
-                        logger.warning(f"Error generating embedding: {str(e)}")
-                        return self._fallback_semantic_score(raw_text, {})
-                else:
-                    # Very basic fallback
-                    logger.warning("raw_text too short, using fallback semantic score")
-                    return 0.3  # Give some baseline score instead of 0
-            
-            if resume_embedding is None:
-                return 0.3  # Fallback score
-            
-            # Calculate cosine similarity
-            job_emb = job_embedding / (np.linalg.norm(job_embedding) + 1e-8)
-            resume_emb = resume_embedding / (np.linalg.norm(resume_embedding) + 1e-8)
-            
-            similarity = np.dot(job_emb, resume_emb)
-            
-            # Normalize to 0-1 range (cosine similarity is -1 to 1, normalize to 0-1)
-            # Most similarities are positive, so we use a more generous normalization
-            similarity = max(0.0, min(1.0, (similarity + 1) / 2))
+            # No usable stored embedding: encode raw_text
+            if not raw_text or len(raw_text.strip()) < 10:
+                resume_data = resume.parsed_data_json or {}
+                raw_text = resume_data.get('raw_text', '') or resume.file_name or ''
             
-            # Ensure minimum score for related content (HR resumes for HR jobs should never be 0)
-            if similarity < 0.4:
-                similarity = 0.4  # Minimum baseline for related content
-                logger.debug(f"Applied minimum semantic score (0.4) for related content")
+            if raw_text and len(raw_text.strip()) >= 10:
+                return None, raw_text, 0.3
             
-            logger.debug(f"Semantic similarity: {similarity:.3f}")
-            return float(similarity)
+            # Very basic fallback
+            logger.warning("raw_text too short, using fallback semantic score")
+            return None, None, 0.3  # Give some baseline score instead of 0
             
         except Exception as e:
-            logger.error(f"Error calculating semantic similarity: {str(e)}", exc_info=True)
-            return 0.3  # Return fallback score instead of 0
+            logger.error(f"Error preparing resume embedding: {str(e)}", exc_info=True)
+            return None, None, 0.3  # Return fallback score instead of 0
+    
+    def _semantic_scores(self, resume_embeddings: np.ndarray, job_embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity (0-1) of each row of an (n x d) embedding matrix to the job embedding"""
+        # One fp16 -> fp32 upcast for the whole matrix; norms in fp16 would lose precision
+        resume_embeddings = resume_embeddings.astype(np.float32, copy=False)
+        if embedding_generator.use_gpu:
+            # Same device as the BERT model; one transfer each way for the whole pool
+            with torch.no_grad():
+                matrix = torch.from_numpy(np.ascontiguousarray(resume_embeddings)).cuda()
+                query = torch.from_numpy(np.ascontiguousarray(job_embedding, dtype=np.float32)).cuda()
+                similarity = torch.nn.functional.cosine_similarity(matrix, query.unsqueeze(0), dim=1, eps=1e-8)
+                similarity = similarity.cpu().numpy().astype(np.float64)
+        else:
+            job_emb = job_embedding.astype(np.float32) / (np.linalg.norm(job_embedding) + 1e-8)
+            norms = np.linalg.norm(resume_embeddings, axis=1) + 1e-8
+            similarity = (resume_embeddings @ job_emb) / norms
+        
+        # Normalize to 0-1 range (cosine similarity is -1 to 1, normalize to 0-1)
+        return np.clip((similarity + 1) / 2, 0.0, 1.0)
     
     def _fallback_semantic_score(self, resume_text: str, resume_data: Dict[str, Any]) -> float:
         """Fallback semantic score based on keyword matching when embeddings fail"""
@@ -2,8 +2,9 @@
 File upload and storage service
 """
 import os
+import shutil
 import uuid
-from typing import Optional, BinaryIO
+from typing import Optional, BinaryIO, Tuple
 from pathlib import Path
 import boto3
 from botocore.exceptions import ClientError
@@ -12,6 +13,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 
 class FileService:
     """Service for handling file uploads and storage"""
@@ -43,8 +46,12 @@ class FileService:
         Validate uploaded file
         Returns: (is_valid, error_message)
         """
+        return self._validate(len(file_content), file_content[:4], filename)
+    
+    def _validate(self, file_size: int, head: bytes, filename: str) -> tuple[bool, Optional[str]]:
+        """Validate size, extension and magic bytes (head = first bytes of the file)"""
         # Check file size
-        if len(file_content) > settings.MAX_UPLOAD_SIZE:
+        if file_size > settings.MAX_UPLOAD_SIZE:
             return False, f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE} bytes"
         
         # Check file extension
@@ -53,7 +60,7 @@ class FileService:
             return False, f"File type {file_ext} not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
         
         # Basic file type validation (check magic bytes)
-        if file_ext == 'pdf' and not file_content.startswith(b'%PDF'):
+        if file_ext == 'pdf' and not head.startswith(b'%PDF'):
             return False, "Invalid PDF file"
         
         return True, None
@@ -100,6 +107,55 @@ class FileService:
             logger.info(f"File saved locally: {file_path}")
             return str(file_path)
     
+    def upload_fileobj(self, fileobj: BinaryIO, filename: str, user_id: str) -> Tuple[str, int]:
+        """
+        Stream a seekable file-like object to S3 or local storage in chunks,
+        without loading it into memory
+        Returns: (file path/URL, file size in bytes)
+        """
+        file_size = fileobj.seek(0, os.SEEK_END)
+        if not file_size:
+            raise ValueError("File is empty")
+        fileobj.seek(0)
+        head = fileobj.read(4)
+        fileobj.seek(0)
+        
+        # Validate file
+        is_valid, error = self._validate(file_size, head, filename)
+        if not is_valid:
+            raise ValueError(error)
+        
+        # Generate unique filename
+        file_ext = Path(filename).suffix.lower()
+        unique_filename = f"{uuid.uuid4()}{file_ext}"
+        
+        if self.use_s3:
+            # Multipart upload straight from the file object
+            s3_key = f"{settings.AWS_S3_RESUME_PREFIX}{user_id}/{unique_filename}"
+            try:
+                self.s3_client.upload_fileobj(
+                    fileobj,
+                    settings.AWS_S3_BUCKET,
+                    s3_key,
+                    ExtraArgs={'ContentType': self._get_content_type(file_ext)}
+                )
+                logger.info(f"File streamed to S3: {s3_key}")
+                return f"s3://{settings.AWS_S3_BUCKET}/{s3_key}", file_size
+            except ClientError as e:
+                logger.error(f"S3 upload error: {str(e)}")
+                raise Exception(f"Failed to upload file to S3: {str(e)}")
+        else:
+            # Save locally
+            user_dir = self.upload_dir / user_id
+            user_dir.mkdir(parents=True, exist_ok=True)
+            
+            file_path = user_dir / unique_filename
+            with open(file_path, 'wb') as f:
+                shutil.copyfileobj(fileobj, f, UPLOAD_CHUNK_SIZE)
+            
+            logger.info(f"File streamed locally: {file_path}")
+            return str(file_path), file_size
+    
     def read_file(self, file_path: str) -> Optional[bytes]:
         """
         Read file content from S3 or local storage
@@ -6,6 +6,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from app.models.interview import Interview, InterviewType, InterviewStatus, InterviewLog
 from app.models.match_result import MatchResult
@@ -39,7 +40,8 @@ class InterviewScheduler:
         online_interview_enabled: bool,
         scheduled_by: UUID,
         notes: Optional[str],
-        db: Session
+        db: Session,
+        prefetched_job: Optional[Job] = None
     ) -> Interview:
         """
         Schedule a new interview
@@ -57,6 +59,8 @@ class InterviewScheduler:
             scheduled_by: User ID who scheduled
             notes: Additional notes
             db: Database session
+            prefetched_job: Job already loaded by a caller that has validated the match
+                result (shortlisted + interview enabled); skips the duplicate lookups
             
         Returns:
             Created Interview object
@@ -65,30 +69,9 @@ class InterviewScheduler:
             ValueError: If validation fails
         """
         try:
-            # Validate job exists
-            job = db.query(Job).filter(Job.id == job_id).first()
-            if not job:
-                raise ValueError(f"Job {job_id} not found")
-            
-            # Validate candidate exists
-            candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-            if not candidate:
-                raise ValueError(f"Candidate {candidate_id} not found")
-            
-            # Check if candidate is shortlisted and interview enabled
-            match_result = db.query(MatchResult).filter(
-                MatchResult.job_id == job_id,
-                MatchResult.candidate_id == candidate_id
-            ).first()
-            
-            if not match_result:
-                raise ValueError(f"Match result not found for job {job_id} and candidate {candidate_id}")
-            
-            if not match_result.shortlisted:
-                raise ValueError("Candidate must be shortlisted before scheduling interview")
-            
-            if not match_result.interview_enabled:
-                raise ValueError("Interview must be enabled for this candidate before scheduling")
+            job = prefetched_job
+            if job is None:
+                job = self._validate_schedulable(job_id, candidate_id, db)
             
             # Validate interview date is in the future
             now = datetime.now(timezone.utc)
@@ -170,6 +153,37 @@ class InterviewScheduler:
             logger.error(f"Error scheduling interview: {str(e)}", exc_info=True)
             raise
     
+    def _validate_schedulable(self, job_id: UUID, candidate_id: UUID, db: Session) -> Job:
+        """
+        Check the job, candidate and match result allow scheduling; returns the job
+        """
+        # Validate job exists
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        
+        # Validate candidate exists
+        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        if not candidate:
+            raise ValueError(f"Candidate {candidate_id} not found")
+        
+        # Check if candidate is shortlisted and interview enabled
+        match_result = db.query(MatchResult).filter(
+            MatchResult.job_id == job_id,
+            MatchResult.candidate_id == candidate_id
+        ).first()
+        
+        if not match_result:
+            raise ValueError(f"Match result not found for job {job_id} and candidate {candidate_id}")
+        
+        if not match_result.shortlisted:
+            raise ValueError("Candidate must be shortlisted before scheduling interview")
+        
+        if not match_result.interview_enabled:
+            raise ValueError("Interview must be enabled for this candidate before scheduling")
+        
+        return job
+    
     def update_interview(
         self,
         interview_id: UUID,
@@ -359,31 +373,39 @@ class InterviewScheduler:
             Updated Interview object
         """
         try:
-            interview = db.query(Interview).filter(Interview.id == interview_id).first()
-            if not interview:
-                raise ValueError(f"Interview {interview_id} not found")
-            
-            if interview.interview_status != InterviewStatus.SCHEDULED:
-                raise ValueError(f"Cannot join interview with status {interview.interview_status.value}")
+            joined_column = {
+                'candidate': Interview.candidate_joined_at,
+                'interviewer': Interview.interviewer_joined_at,
+            }.get(participant_type)
+            if joined_column is None:
+                raise ValueError(f"Invalid participant_type: {participant_type}")
             
             now = datetime.now(timezone.utc)
             
-            if participant_type == 'candidate':
-                if interview.candidate_joined_at is None:
-                    interview.candidate_joined_at = now
-                    interview.interview_status = InterviewStatus.IN_PROGRESS
-                    logger.info(f"Candidate joined interview: {interview.id}")
-            elif participant_type == 'interviewer':
-                if interview.interviewer_joined_at is None:
-                    interview.interviewer_joined_at = now
-                    if interview.interview_status == InterviewStatus.SCHEDULED:
-                        interview.interview_status = InterviewStatus.IN_PROGRESS
-                    logger.info(f"Interviewer joined interview: {interview.id}")
-            else:
-                raise ValueError(f"Invalid participant_type: {participant_type}")
+            # Status check, first-join timestamp and status flip in one UPDATE ... RETURNING;
+            # populate_existing refreshes an instance the caller may already hold
+            interview = db.execute(
+                update(Interview)
+                .where(
+                    Interview.id == interview_id,
+                    Interview.interview_status == InterviewStatus.SCHEDULED
+                )
+                .values({
+                    joined_column: func.coalesce(joined_column, now),
+                    Interview.interview_status: InterviewStatus.IN_PROGRESS,
+                })
+                .returning(Interview)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+            
+            if interview is None:
+                interview = db.get(Interview, interview_id)
+                if not interview:
+                    raise ValueError(f"Interview {interview_id} not found")
+                raise ValueError(f"Cannot join interview with status {interview.interview_status.value}")
             
             db.commit()
-            db.refresh(interview)
+            logger.info(f"{participant_type.capitalize()} joined interview: {interview.id}")
             
             # Log attendance
             self._log_interview_action(
@@ -451,8 +473,6 @@ class InterviewScheduler:
             
             if updated_interviews:
                 db.commit()
-                for interview in updated_interviews:
-                    db.refresh(interview)
             
             return updated_interviews
             
@@ -12,11 +12,15 @@ from app.services.bias_detector import bias_detector
 from app.services.optimization import performance_optimizer
 from app.services.audit_logger import audit_logger
 from app.database import SessionLocal
+from app.core.redis_client import cache_delete_many
 from app.models.job import Job
 from app.models.resume import Resume
 from app.models.candidate import Candidate
 from app.models.match_result import MatchResult
+from app.schemas.match_result import result_cache_key
 from app.models.processing_queue import ProcessingQueue, ProcessingStatus
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 import uuid
 
@@ -259,8 +263,9 @@ class MatchingOrchestrator:
             
             # Get embedding from resume or generate
             resume_data = resume.parsed_data_json
-            if resume.embedding_vector:
-                embedding = np.array(resume.embedding_vector)
+            if resume.embedding_vector is not None:
+                vec = resume.embedding_vector
+                embedding = np.asarray(vec if isinstance(vec, list) else vec.to_numpy(), dtype=np.float32)
             else:
                 # Generate from text
                 text = resume_data.get('raw_text', '')
@@ -345,40 +350,44 @@ class MatchingOrchestrator:
     ) -> None:
         """Store match results in database"""
         try:
+            # One multi-row upsert on uq_match_results_job_candidate instead of a
+            # SELECT + UPDATE/INSERT round-trip per candidate
+            rows = {}
             for rank, candidate_result in enumerate(ranked_candidates, start=1):
                 candidate_id = candidate_result['candidate_id']
-                
-                # Check if result already exists
-                existing = db.query(MatchResult).filter(
-                    MatchResult.job_id == job_id,
-                    MatchResult.candidate_id == candidate_id
-                ).first()
-                
-                if existing:
-                    # Update existing
-                    existing.overall_score = candidate_result['overall_score']
-                    existing.scores_json = candidate_result.get('component_scores', {})
-                    existing.rank = str(rank)
-                    existing.explanation = {
+                if candidate_id in rows:
+                    continue  # ON CONFLICT cannot touch the same row twice in one statement
+                rows[candidate_id] = {
+                    'id': uuid.uuid4(),
+                    'job_id': job_id,
+                    'candidate_id': candidate_id,
+                    'overall_score': candidate_result['overall_score'],
+                    'scores_json': candidate_result.get('component_scores', {}),
+                    'rank': rank,
+                    'explanation': {
                         'text': candidate_result.get('explanation', ''),
                         'breakdown': candidate_result.get('breakdown', {})
+                    },
+                }
+            
+            stored_ids = []
+            if rows:
+                stmt = pg_insert(MatchResult).values(list(rows.values()))
+                # Interview/shortlist flags are left untouched on re-scoring
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[MatchResult.job_id, MatchResult.candidate_id],
+                    set_={
+                        'overall_score': stmt.excluded.overall_score,
+                        'scores_json': stmt.excluded.scores_json,
+                        'rank': stmt.excluded.rank,
+                        'explanation': stmt.excluded.explanation,
+                        'updated_at': func.now(),
                     }
-                else:
-                    # Create new
-                    match_result = MatchResult(
-                        job_id=job_id,
-                        candidate_id=candidate_id,
-                        overall_score=candidate_result['overall_score'],
-                        scores_json=candidate_result.get('component_scores', {}),
-                        rank=str(rank),
-                        explanation={
-                            'text': candidate_result.get('explanation', ''),
-                            'breakdown': candidate_result.get('breakdown', {})
-                        }
-                    )
-                    db.add(match_result)
+                )
+                stored_ids = db.execute(stmt.returning(MatchResult.id)).scalars().all()
             
             db.commit()
+            cache_delete_many([result_cache_key(result_id) for result_id in stored_ids])
             logger.info(f"Stored {len(ranked_candidates)} match results")
             
         except Exception as e:
@@ -172,10 +172,14 @@ class NLPPipeline:
         
         # Generate TF-IDF embedding
         try:
-            tfidf_embedding = embedding_generator.generate_tfidf_embedding(text, fit=True)
+            tfidf_embedding = embedding_generator.generate_tfidf_embedding(text)
             if tfidf_embedding is not None:
-                embeddings['tfidf'] = tfidf_embedding.tolist()
-                embeddings['tfidf_dimension'] = len(tfidf_embedding)
+                # Sparse row stored as its non-zero entries
+                embeddings['tfidf'] = {
+                    'indices': tfidf_embedding.indices.tolist(),
+                    'values': tfidf_embedding.data.tolist()
+                }
+                embeddings['tfidf_dimension'] = tfidf_embedding.shape[1]
         except Exception as e:
             logger.warning(f"TF-IDF embedding generation failed: {str(e)}")
         
@@ -0,0 +1,28 @@
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.services.interview_scheduler import interview_scheduler
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.interview_tasks.auto_update_interview_statuses")
+def auto_update_interview_statuses():
+    """
+    Mark past interviews as COMPLETED / NO_SHOW.
+    Runs every 5 minutes (configured in celery_app.py) and on demand via
+    POST /interviews/auto-update-status.
+    """
+    # Keep the updated rows readable after commit without a reload per interview
+    db: Session = SessionLocal(expire_on_commit=False)
+    
+    try:
+        updated = interview_scheduler.update_interview_status_auto(db)
+        logger.info(f"Auto-updated {len(updated)} interview statuses")
+        return {
+            "updated_count": len(updated),
+            "updated_interviews": [str(i.id) for i in updated]
+        }
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.job import Job
+from app.models.resume import Resume
+from app.schemas.job import CandidateMatchResult, MatchCandidatesResponse
+from app.core.redis_client import cache_set
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+import hashlib
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MATCH_CACHE_TTL = 600  # seconds
+
+
+def match_cache_key(job: Job, resume_rows) -> str:
+    """Key for a job's match response; changes whenever the job or any resume is added, edited or removed"""
+    digest = hashlib.blake2b(job.updated_at.isoformat().encode(), digest_size=16)
+    for resume_id, updated_at in resume_rows:
+        digest.update(resume_id.bytes)
+        digest.update(updated_at.isoformat().encode())
+    return f"match:{job.id}:{digest.hexdigest()}"
+
+
+def match_task_id(job_id) -> str:
+    """Celery task id for a matching run; embeds the job id so status polls can be tied to their job"""
+    return f"match-{job_id}-{uuid.uuid4().hex}"
+
+
+def is_match_task_for_job(task_id: str, job_id) -> bool:
+    """Whether task_id was issued by match_task_id for job_id"""
+    return task_id.startswith(f"match-{job_id}-")
+
+
+@celery_app.task(name="app.tasks.matching_tasks.match_candidates")
+def match_candidates_task(job_id: str):
+    """
+    Match all candidates to a job (POST /jobs/{job_id}/match-candidates).
+    The response is cached in Redis and returned as the task result.
+    """
+    db: Session = SessionLocal()
+    
+    try:
+        job = db.get(Job, job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        
+        # Fingerprint the resume set before matching so a concurrent upload invalidates this entry
+        resume_rows = db.execute(select(Resume.id, Resume.updated_at).order_by(Resume.id)).all()
+        cache_key = match_cache_key(job, resume_rows)
+        job_title = job.title
+        
+        # Imported on first use so the API process (which only queues this task) never loads torch
+        from app.services.candidate_matcher import candidate_matcher
+        match_results = candidate_matcher.match_candidates_to_job(job_id=job_id, db=db)
+        
+        # Convert to response format
+        ranked_candidates = []
+        for candidate in match_results.get('ranked_candidates', []):
+            try:
+                # Ensure all required fields are present with defaults
+                candidate_data = {
+                    'candidate_id': str(candidate.get('candidate_id', '')),
+                    'anonymized_id': str(candidate.get('anonymized_id', '')),
+                    'resume_id': str(candidate.get('resume_id', '')),
+                    'resume_file_name': str(candidate.get('resume_file_name', '')),
+                    'candidate_name': str(candidate.get('candidate_name', 'Anonymous')),
+                    'final_score': float(candidate.get('final_score', 0.0)),
+                    'rank': int(candidate.get('rank', 0)),
+                    'component_scores': dict(candidate.get('component_scores', {})),
+                    'matched_skills': list(candidate.get('matched_skills', [])),
+                    'missing_skills': list(candidate.get('missing_skills', [])),
+                    'experience_summary': str(candidate.get('experience_summary', ''))
+                }
+                # Fields are coerced above, so skip re-validating every candidate
+                ranked_candidates.append(CandidateMatchResult.model_construct(**candidate_data))
+            except Exception as e:
+                logger.error(f"Error creating CandidateMatchResult: {str(e)}", exc_info=True)
+                logger.error(f"Candidate data: {candidate}")
+                # Skip invalid candidates
+                continue
+        
+        response = MatchCandidatesResponse.model_construct(
+            job_id=str(match_results.get('job_id', job_id)),
+            job_title=str(match_results.get('job_title', job_title)),
+            candidates_matched=int(match_results.get('candidates_matched', len(ranked_candidates))),
+            ranked_candidates=ranked_candidates,
+            matching_weights=dict(match_results.get('matching_weights', {'skills': 0.5, 'experience': 0.3, 'semantic': 0.2})),
+            message=match_results.get('message')
+        )
+        cache_set(cache_key, response.model_dump_json(), MATCH_CACHE_TTL)
+        
+        logger.info(f"Matched {response.candidates_matched} candidates to job {job_id}")
+        return response.model_dump(mode="json")
+    finally:
+        db.close()
@@ -0,0 +1,40 @@
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.resume import Resume
+from sqlalchemy import select
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.model_tasks.fit_tfidf")
+def fit_tfidf_task(version: Optional[str] = None):
+    """
+    Fit the TF-IDF vectorizer on the extracted text of all parsed resumes and make it
+    the active 'tfidf' registry version. Run on demand (not scheduled), e.g.:
+    
+        celery -A app.celery_app call app.tasks.model_tasks.fit_tfidf
+    
+    The pickle is written to the model registry directory, so it must be shared with
+    the io workers for them to pick it up on restart. Stored TF-IDF embeddings were
+    produced with the previous vocabulary; reprocess resumes to refresh them.
+    """
+    db = SessionLocal()
+    try:
+        raw_text = Resume.parsed_data_json['raw_text'].astext
+        corpus = db.execute(select(raw_text).where(raw_text != '')).scalars().all()
+        if not corpus:
+            logger.warning("No parsed resume text to fit TF-IDF on; keeping the current vectorizer")
+            return {"status": "skipped", "documents": 0}
+        
+        # Imported here so the beat/API processes importing this module don't load the models
+        from app.ml.embeddings import embedding_generator
+        version = embedding_generator.fit_tfidf(corpus, version=version)
+        logger.info(f"TF-IDF version {version} fitted on {len(corpus)} resumes")
+        return {"status": "success", "version": version, "documents": len(corpus)}
+    except Exception as e:
+        logger.error(f"Error fitting TF-IDF: {str(e)}", exc_info=True)
+        raise
+    finally:
+        db.close()
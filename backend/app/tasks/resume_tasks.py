@@ -5,7 +5,7 @@ from app.models.resume import Resume, ResumeStatus
 from app.models.processing_queue import ProcessingQueue, ProcessingStatus
 from app.models.candidate import Candidate
 from app.services.file_service import file_service
-from app.services.nlp_pipeline import nlp_pipeline
+from app.core.redis_client import cache_delete
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
@@ -15,6 +15,11 @@ from typing import Dict, Any
 logger = logging.getLogger(__name__)
 
 
+def resume_cache_key(resume_id) -> str:
+    """Redis key of the serialized GET /resumes/{id} response"""
+    return f"resume:{resume_id}"
+
+
 @celery_app.task(
     name="app.tasks.resume_tasks.process_resume",
     bind=True,
@@ -44,6 +49,7 @@ def process_resume(self, resume_id: str):
         # Update resume status
         resume.status = ResumeStatus.PARSING
         db.commit()
+        cache_delete(resume_cache_key(resume_id))
         
         # Create or update processing queue entry
         queue_entry = db.query(ProcessingQueue).filter(
@@ -55,12 +61,12 @@ def process_resume(self, resume_id: str):
                 job_id=uuid.uuid4(),  # Placeholder, should be set when matching with job
                 resume_id=resume.id,
                 status=ProcessingStatus.PROCESSING,
-                progress="10"
+                progress=10
             )
             db.add(queue_entry)
         else:
             queue_entry.status = ProcessingStatus.PROCESSING
-            queue_entry.progress = "10"
+            queue_entry.progress = 10
             queue_entry.error_message = None
         
         db.commit()
@@ -72,11 +78,13 @@ def process_resume(self, resume_id: str):
         if not file_content:
             raise Exception("Failed to load file content")
         
-        queue_entry.progress = "20"
+        queue_entry.progress = 20
         db.commit()
         
         # Step 2: Run complete NLP pipeline
         logger.info(f"Running NLP pipeline for resume: {resume_id}")
+        # Imported on first use so the API process (which only queues this task) never loads spaCy/BERT
+        from app.services.nlp_pipeline import nlp_pipeline
         nlp_result = nlp_pipeline.process_resume(
             file_content=file_content,
             file_type=resume.file_type,
@@ -87,7 +95,7 @@ def process_resume(self, resume_id: str):
         if not nlp_result.get('success'):
             raise Exception(f"NLP pipeline failed: {nlp_result.get('errors', [])}")
         
-        queue_entry.progress = "70"
+        queue_entry.progress = 70
         db.commit()
         
         # Step 3: Update resume with parsed data
@@ -108,7 +116,7 @@ def process_resume(self, resume_id: str):
         
         resume.parsed_data_json = parsed_data
         resume.status = ResumeStatus.PARSED
-        queue_entry.progress = "80"
+        queue_entry.progress = 80
         db.commit()
         
         # Step 4: Update embedding vector
@@ -116,9 +124,10 @@ def process_resume(self, resume_id: str):
         embeddings = nlp_result.get('embeddings', {})
         if embeddings.get('bert'):
             import numpy as np
-            embedding_array = np.array(embeddings['bert'])
+            # Stored as halfvec(384): cast to float16 up front so the column gets exactly what we send
+            embedding_array = np.asarray(embeddings['bert'], dtype=np.float16)
             resume.embedding_vector = embedding_array.tolist()
-            queue_entry.progress = "90"
+            queue_entry.progress = 90
             db.commit()
         else:
             logger.warning("No BERT embedding generated")
@@ -139,7 +148,7 @@ def process_resume(self, resume_id: str):
         # Update status to processed
         resume.status = ResumeStatus.PROCESSED
         queue_entry.status = ProcessingStatus.COMPLETED
-        queue_entry.progress = "100"
+        queue_entry.progress = 100
         queue_entry.processed_at = datetime.utcnow()
         db.commit()
         
@@ -167,7 +176,7 @@ def process_resume(self, resume_id: str):
             if queue_entry:
                 queue_entry.status = ProcessingStatus.FAILED
                 queue_entry.error_message = str(e)
-                queue_entry.retry_count = str(int(queue_entry.retry_count or "0") + 1)
+                queue_entry.retry_count = ProcessingQueue.retry_count + 1
                 db.commit()
         except Exception as db_error:
             logger.error(f"Failed to update error status: {str(db_error)}")
@@ -185,6 +194,8 @@ def process_resume(self, resume_id: str):
                 "retries": self.request.retries
             }
     finally:
+        # Drop any state cached while processing ran
+        cache_delete(resume_cache_key(resume_id))
         db.close()
 
 
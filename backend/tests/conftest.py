@@ -4,10 +4,13 @@ Pytest configuration and fixtures
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
+from sqlalchemy.pool import NullPool
+from app.database import Base, get_db, get_async_db
+from app.core.dependencies import invalidate_cached_user
 from app.main import app
-from app.core.config import settings
+from app.core.config import settings, to_async_database_url
 import os
 
 # Use test database
@@ -15,6 +18,8 @@ TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "postgresql://postgres:postgr
 
 engine = create_engine(TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# NullPool: TestClient may run each request on a different event loop
+async_engine = create_async_engine(to_async_database_url(TEST_DATABASE_URL), poolclass=NullPool)
 
 
 @pytest.fixture(scope="function")
@@ -38,10 +43,17 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    # Users are recreated per test; don't let a cached row leak into the next one
+    invalidate_cached_user()
 
 
 @pytest.fixture
@@ -2,9 +2,18 @@
 Tests for API endpoints
 """
 import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api.v1 import resumes as resumes_api
+from app.core.config import settings
+from app.core.dependencies import get_current_active_user
 from app.core.security import create_access_token
+from app.database import get_async_db
+from app.schemas.user import AuthenticatedUser
 from tests.fixtures.database import override_get_db, test_user, test_job, test_resume
 
 
@@ -161,6 +170,127 @@ class TestResumeEndpoints:
         assert response.status_code == 200
 
 
+def _stored_resumes(rows):
+    """Stand-in for the INSERT ... RETURNING result of upload-batch"""
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(id=uuid4(), parsed_data_json=None, created_at=now, updated_at=now, **row)
+        for row in rows
+    ]
+
+
+@pytest.fixture
+def batch_upload(monkeypatch):
+    """Client for upload-batch with storage, the async session and Celery stubbed out"""
+    def upload_fileobj(fileobj, filename, user_id):
+        if filename.startswith("bad"):
+            raise ValueError("Invalid file type")
+        return f"/uploads/{user_id}/{filename}", len(fileobj.read())
+    
+    file_service = MagicMock()
+    file_service.upload_fileobj.side_effect = upload_fileobj
+    celery_group = MagicMock()
+    monkeypatch.setattr(resumes_api, "file_service", file_service)
+    monkeypatch.setattr(resumes_api, "group", celery_group)
+    
+    session = MagicMock()
+    session.scalars = AsyncMock(side_effect=lambda stmt, rows: MagicMock(all=lambda: _stored_resumes(rows)))
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    
+    async def override_get_async_db():
+        yield session
+    
+    now = datetime.now(timezone.utc)
+    user = AuthenticatedUser(
+        id=uuid4(), email="test@example.com", is_active=True, is_superuser=False,
+        created_at=now, updated_at=now
+    )
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    yield SimpleNamespace(
+        client=TestClient(app),
+        user=user,
+        session=session,
+        file_service=file_service,
+        group=celery_group,
+    )
+    app.dependency_overrides.clear()
+
+
+def _pdf(name):
+    return ("files", (name, b"%PDF-1.4 resume", "application/pdf"))
+
+
+class TestResumeBatchUpload:
+    """Tests for POST /resumes/upload-batch"""
+    
+    def test_upload_batch(self, batch_upload):
+        """Every file is stored, inserted, and queued for processing"""
+        response = batch_upload.client.post(
+            "/api/v1/resumes/upload-batch",
+            files=[_pdf("first.pdf"), _pdf("second.pdf")]
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert [item["file_name"] for item in data] == ["first.pdf", "second.pdf"]
+        assert all(item["file_type"] == "pdf" for item in data)
+        assert all(item["uploaded_by"] == str(batch_upload.user.id) for item in data)
+        batch_upload.session.commit.assert_awaited_once()
+        batch_upload.file_service.delete_file.assert_not_called()
+    
+    def test_upload_batch_dispatches_one_group(self, batch_upload):
+        """Processing is published as a single Celery group with one task per resume"""
+        response = batch_upload.client.post(
+            "/api/v1/resumes/upload-batch",
+            files=[_pdf("first.pdf"), _pdf("second.pdf")]
+        )
+        assert response.status_code == 201
+        batch_upload.group.assert_called_once()
+        signatures = list(batch_upload.group.call_args.args[0])
+        assert [sig.args for sig in signatures] == [(item["id"],) for item in response.json()]
+        batch_upload.group.return_value.apply_async.assert_called_once_with()
+    
+    def test_upload_batch_rejected_file_cleans_up(self, batch_upload):
+        """One rejected file fails the batch and removes the files already stored"""
+        response = batch_upload.client.post(
+            "/api/v1/resumes/upload-batch",
+            files=[_pdf("good.pdf"), _pdf("bad.pdf")]
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("bad.pdf")
+        batch_upload.file_service.delete_file.assert_called_once_with(
+            f"/uploads/{batch_upload.user.id}/good.pdf"
+        )
+        batch_upload.session.scalars.assert_not_awaited()
+        batch_upload.group.assert_not_called()
+    
+    def test_upload_batch_insert_failure_cleans_up(self, batch_upload):
+        """A failed INSERT rolls back and removes every stored file"""
+        batch_upload.session.scalars.side_effect = RuntimeError("connection lost")
+        response = batch_upload.client.post(
+            "/api/v1/resumes/upload-batch",
+            files=[_pdf("first.pdf"), _pdf("second.pdf")]
+        )
+        assert response.status_code == 500
+        batch_upload.session.rollback.assert_awaited_once()
+        deleted = {call.args[0] for call in batch_upload.file_service.delete_file.call_args_list}
+        assert deleted == {
+            f"/uploads/{batch_upload.user.id}/first.pdf",
+            f"/uploads/{batch_upload.user.id}/second.pdf",
+        }
+        batch_upload.group.assert_not_called()
+    
+    def test_upload_batch_file_limit(self, batch_upload):
+        """Batches over MAX_BATCH_UPLOAD_FILES are refused before anything is stored"""
+        files = [_pdf(f"resume{i}.pdf") for i in range(settings.MAX_BATCH_UPLOAD_FILES + 1)]
+        response = batch_upload.client.post("/api/v1/resumes/upload-batch", files=files)
+        assert response.status_code == 400
+        assert str(settings.MAX_BATCH_UPLOAD_FILES) in response.json()["detail"]
+        batch_upload.file_service.upload_fileobj.assert_not_called()
+        batch_upload.session.scalars.assert_not_awaited()
+
+
 class TestResultsEndpoints:
     """Tests for results endpoints"""
     
@@ -0,0 +1,149 @@
+"""
+Tests for candidate shortlisting endpoints
+"""
+import uuid
+import pytest
+from fastapi import status
+from app.core.dependencies import invalidate_cached_user
+from app.models.candidate import Candidate
+from app.models.match_result import MatchResult
+from app.models.resume import Resume, ResumeStatus
+from app.models.user import User
+
+
+@pytest.fixture
+def job_with_candidates(client, auth_headers, db_session, test_user_data):
+    """A job owned by the test user and two candidates to shortlist for it"""
+    user_id = db_session.query(User.id).filter(User.email == test_user_data["email"]).scalar()
+    job_id = client.post(
+        "/api/v1/jobs",
+        json={"title": "Software Engineer", "description": "Test description"},
+        headers=auth_headers
+    ).json()["id"]
+
+    candidate_ids = []
+    for i in range(2):
+        resume = Resume(
+            file_path=f"/uploads/resume_{i}.pdf",
+            file_name=f"resume_{i}.pdf",
+            file_type="pdf",
+            status=ResumeStatus.PROCESSED,
+            uploaded_by=user_id
+        )
+        db_session.add(resume)
+        db_session.flush()
+        candidate = Candidate(anonymized_id=f"anon_{i}", resume_id=resume.id)
+        db_session.add(candidate)
+        db_session.flush()
+        candidate_ids.append(str(candidate.id))
+    db_session.commit()
+
+    return job_id, candidate_ids
+
+
+def _match_results(db_session, job_id):
+    db_session.expire_all()
+    return db_session.query(MatchResult).filter(MatchResult.job_id == job_id).all()
+
+
+def test_shortlist_on_cold_auth_cache(client, auth_headers, job_with_candidates):
+    """The auth lookup shares the handler's session; the write must still commit"""
+    job_id, candidate_ids = job_with_candidates
+    invalidate_cached_user()
+
+    response = client.post(
+        f"/api/v1/candidates/{candidate_ids[0]}/shortlist",
+        params={"job_id": job_id},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["shortlisted"] is True
+
+
+def test_toggle_interview_on_cold_auth_cache(client, auth_headers, job_with_candidates):
+    """Toggling right after the user cache is cleared succeeds"""
+    job_id, candidate_ids = job_with_candidates
+    client.post(
+        f"/api/v1/candidates/{candidate_ids[0]}/shortlist",
+        params={"job_id": job_id},
+        headers=auth_headers
+    )
+    invalidate_cached_user()
+
+    response = client.post(
+        f"/api/v1/candidates/{candidate_ids[0]}/toggle-interview",
+        params={"job_id": job_id},
+        json={"interview_enabled": True},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["interview_enabled"] is True
+
+
+def test_bulk_shortlist(client, auth_headers, db_session, job_with_candidates):
+    """Shortlisting creates a match_result per candidate"""
+    job_id, candidate_ids = job_with_candidates
+    invalidate_cached_user()
+
+    response = client.post(
+        "/api/v1/candidates/bulk-shortlist",
+        json={"job_id": job_id, "items": [{"candidate_id": c} for c in candidate_ids]},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["updated_count"] == 2
+    assert {item["candidate_id"] for item in data["items"]} == set(candidate_ids)
+    assert all(item["shortlisted"] and not item["interview_enabled"] for item in data["items"])
+    assert len(_match_results(db_session, job_id)) == 2
+
+
+def test_bulk_shortlist_repeat_is_idempotent(client, auth_headers, db_session, job_with_candidates):
+    """Re-shortlisting keeps the interview state; unshortlisting clears it"""
+    job_id, candidate_ids = job_with_candidates
+    body = {"job_id": job_id, "items": [{"candidate_id": c} for c in candidate_ids]}
+    invalidate_cached_user()
+    response = client.post("/api/v1/candidates/bulk-shortlist", json=body, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    toggle = client.post(
+        f"/api/v1/candidates/{candidate_ids[0]}/toggle-interview",
+        params={"job_id": job_id},
+        json={"interview_enabled": True},
+        headers=auth_headers
+    )
+    assert toggle.status_code == status.HTTP_200_OK
+
+    response = client.post("/api/v1/candidates/bulk-shortlist", json=body, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    items = {item["candidate_id"]: item for item in response.json()["items"]}
+    assert items[candidate_ids[0]]["shortlisted"] is True
+    assert items[candidate_ids[0]]["interview_enabled"] is True
+    assert items[candidate_ids[1]]["interview_enabled"] is False
+    assert len(_match_results(db_session, job_id)) == 2
+
+    response = client.post(
+        "/api/v1/candidates/bulk-shortlist",
+        json={"job_id": job_id, "items": [{"candidate_id": candidate_ids[0], "shortlisted": False}]},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    item = response.json()["items"][0]
+    assert item["shortlisted"] is False
+    assert item["interview_enabled"] is False
+
+
+def test_bulk_shortlist_unknown_candidate(client, auth_headers, db_session, job_with_candidates):
+    """An unknown candidate fails the whole batch; nothing is written"""
+    job_id, candidate_ids = job_with_candidates
+    invalidate_cached_user()
+
+    response = client.post(
+        "/api/v1/candidates/bulk-shortlist",
+        json={
+            "job_id": job_id,
+            "items": [{"candidate_id": candidate_ids[0]}, {"candidate_id": str(uuid.uuid4())}]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert _match_results(db_session, job_id) == []
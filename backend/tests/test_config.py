@@ -0,0 +1,42 @@
+"""
+Tests for application configuration helpers
+"""
+import pytest
+from pydantic import ValidationError
+from app.core.config import configure_hnsw_params, get_settings, settings, to_async_database_url
+
+
+def test_hnsw_params_small_index():
+    """Small collections use the pgvector defaults"""
+    params = configure_hnsw_params(0)
+    assert params == {"m": 16, "ef_construction": 64, "ef_search": 40}
+
+
+def test_hnsw_params_grow_with_vector_count():
+    """Build and search breadth never shrink as the index grows"""
+    counts = [10_000, 500_000, 5_000_000, 50_000_000]
+    params = [configure_hnsw_params(n) for n in counts]
+    for smaller, larger in zip(params, params[1:]):
+        assert larger["m"] >= smaller["m"]
+        assert larger["ef_construction"] >= smaller["ef_construction"]
+        assert larger["ef_search"] >= smaller["ef_search"]
+
+
+def test_async_database_url_uses_asyncpg():
+    """Sync URLs (with or without an explicit driver) map to the asyncpg dialect"""
+    expected = "postgresql+asyncpg://u:p%40ss@db:5432/app"
+    assert to_async_database_url("postgresql://u:p%40ss@db:5432/app") == expected
+    assert to_async_database_url("postgresql+psycopg2://u:p%40ss@db:5432/app") == expected
+    assert to_async_database_url("postgres://u:p%40ss@db:5432/app") == expected
+
+
+def test_get_settings_is_memoized():
+    """Settings are built once and shared with the module-level alias"""
+    assert get_settings() is get_settings()
+    assert get_settings() is settings
+
+
+def test_settings_are_frozen():
+    """Settings can't be reassigned after startup"""
+    with pytest.raises(ValidationError):
+        settings.DEBUG = not settings.DEBUG
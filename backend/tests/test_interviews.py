@@ -0,0 +1,105 @@
+"""
+Tests for interview listing endpoints
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import status
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.models.resume import Resume, ResumeStatus
+from app.models.user import User
+
+
+@pytest.fixture
+def interviews(client, auth_headers, db_session, test_user_data):
+    """Five interviews for one job; three share the same interview_date"""
+    user_id = db_session.query(User.id).filter(User.email == test_user_data["email"]).scalar()
+    job_id = uuid.UUID(client.post(
+        "/api/v1/jobs",
+        json={"title": "Software Engineer", "description": "Test description"},
+        headers=auth_headers
+    ).json()["id"])
+
+    resume = Resume(
+        file_path="/uploads/resume.pdf",
+        file_name="resume.pdf",
+        file_type="pdf",
+        status=ResumeStatus.PROCESSED,
+        uploaded_by=user_id
+    )
+    db_session.add(resume)
+    db_session.flush()
+    candidate = Candidate(anonymized_id="anon_interviews", resume_id=resume.id)
+    db_session.add(candidate)
+    db_session.flush()
+
+    base = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=7)
+    dates = [base, base, base, base - timedelta(days=1), base + timedelta(days=1)]
+    rows = [
+        Interview(
+            job_id=job_id,
+            candidate_id=candidate.id,
+            interview_date=interview_date,
+            interview_time="10:00",
+            scheduled_by=user_id
+        )
+        for interview_date in dates
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+
+    # The order list_interviews pages in: newest first, id breaking date ties
+    ordered = sorted(rows, key=lambda i: (i.interview_date, i.id), reverse=True)
+    return [str(i.id) for i in ordered]
+
+
+def test_list_interviews_keyset_pages(client, auth_headers, interviews):
+    """Walking next_cursor visits every interview once, in order, across equal dates"""
+    response = client.get("/api/v1/interviews", params={"page_size": 2}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == len(interviews)
+    seen = [item["id"] for item in data["items"]]
+
+    while data["next_cursor"]:
+        response = client.get(
+            "/api/v1/interviews",
+            params={"page_size": 2, "cursor": data["next_cursor"]},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["items"])
+
+    assert seen == interviews
+
+
+def test_list_interviews_last_page_has_no_cursor(client, auth_headers, interviews):
+    """A page that reaches the end returns next_cursor=None"""
+    response = client.get("/api/v1/interviews", params={"page_size": 3}, headers=auth_headers)
+    first = response.json()
+    assert first["next_cursor"] is not None
+
+    response = client.get(
+        "/api/v1/interviews",
+        params={"page_size": 3, "cursor": first["next_cursor"]},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is None
+
+    # Exactly page_size rows left still ends the walk
+    response = client.get("/api/v1/interviews", params={"page_size": 5}, headers=auth_headers)
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bm9waXBl", "MjAyNS0wMS0wMXxub3QtYS11dWlk"])
+def test_list_interviews_malformed_cursor(client, auth_headers, cursor):
+    """A cursor that doesn't decode to (date, id) is a 400"""
+    response = client.get("/api/v1/interviews", params={"cursor": cursor}, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -1,10 +1,12 @@
 """
 Tests for matching and ranking components
 """
+import numpy as np
 import pytest
 from app.services.scoring_engine import scoring_engine
 from app.services.ranking_engine import ranking_engine
 from app.services.bias_detector import bias_detector
+from app.services.candidate_matcher import competition_ranks
 
 
 def test_scoring_engine_basic():
@@ -87,6 +89,22 @@ def test_ranking_engine():
     assert result['ranked_candidates'][0]['overall_score'] >= result['ranked_candidates'][1]['overall_score']
 
 
+def test_competition_ranks_ties():
+    """Tied scores share a rank and the next rank is skipped"""
+    scores = np.array([72.5, 91.0, 72.5, 60.25, 91.0, 72.5])
+    
+    ranks = competition_ranks(scores)
+    
+    assert ranks.tolist() == [3, 1, 3, 6, 1, 3]
+
+
+def test_competition_ranks_distinct():
+    """Without ties, ranks are plain positions by descending score"""
+    ranks = competition_ranks(np.array([10.0, 30.0, 20.0]))
+    
+    assert ranks.tolist() == [3, 1, 2]
+
+
 def test_bias_detection():
     """Test bias detection in job description"""
     job_description = """
@@ -114,7 +114,8 @@ export const getInterviews = async (params: {
   status?: string;
   page?: number;
   pageSize?: number;
-}): Promise<{ items: Interview[]; total: number; page: number; page_size: number }> => {
+  cursor?: string;
+}): Promise<{ items: Interview[]; total: number | null; page: number; page_size: number; next_cursor: string | null }> => {
   const response = await api.get('/interviews', { params });
   return response.data;
 };
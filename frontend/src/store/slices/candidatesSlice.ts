@@ -10,6 +10,10 @@ interface CandidatesState {
   total: number;
 }
 
+const MATCH_POLL_INTERVAL_MS = 2000;
+// Give up after 5 minutes: Celery reports PENDING both for queued tasks and for ones no worker will run
+const MATCH_POLL_MAX_ATTEMPTS = 150;
+
 const initialState: CandidatesState = {
   matchResults: [],
   currentCandidate: null,
@@ -36,7 +40,22 @@ export const matchJobToCandidates = createAsyncThunk(
   }) => {
     // Use the new simplified matching endpoint
     const response = await api.post(`/jobs/${params.jobId}/match-candidates`);
-    return response.data;
+    if (response.status !== 202) {
+      return response.data;
+    }
+    // Not cached: matching runs in the background, poll until the task finishes
+    const { task_id } = response.data;
+    for (let attempt = 0; attempt < MATCH_POLL_MAX_ATTEMPTS; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, MATCH_POLL_INTERVAL_MS));
+      const poll = await api.get(`/jobs/${params.jobId}/match-candidates/${task_id}`);
+      if (poll.data.status === 'SUCCESS') {
+        return poll.data.result;
+      }
+      if (poll.data.status === 'FAILURE') {
+        throw new Error(poll.data.error || 'Candidate matching failed');
+      }
+    }
+    throw new Error('Candidate matching is taking too long; please try again later');
   }
 );
 